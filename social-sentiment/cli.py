@@ -165,8 +165,11 @@ def cmd_scan(args):
     print(f"  WATCHLIST SENTIMENT SCAN")
     print(f"{'='*60}")
     
-    for ticker in (tickers or list(agg.ticker_data.keys())[:10]):
-        summary = agg.get_ticker_summary(ticker)
+    scan_tickers = tickers or list(agg.ticker_data.keys())[:10]
+    alerts_by_ticker = agg.get_alerts_by_ticker(scan_tickers)
+    
+    for ticker in scan_tickers:
+        summary = agg.get_ticker_summary(ticker, alerts_by_ticker[ticker])
         if summary['mention_count'] > 0:
             sent = format_sentiment(summary['sentiment_score'])
             alert_count = len(summary['alerts'])
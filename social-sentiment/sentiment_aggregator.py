@@ -10,9 +10,25 @@ from datetime import datetime, timedelta
 from dataclasses import dataclass, field, asdict
 from typing import Dict, List, Optional, Tuple
 from collections import defaultdict
+from bisect import bisect_left
+import heapq
 import random
 import math
 
+# NumPy is optional - vectorized paths fall back to pure Python without it
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+# orjson is optional - serializes in C, falls back to the stdlib json module
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
 # Sentiment lexicon for stock-specific terms
 BULLISH_TERMS = {
     'moon', 'rocket', 'calls', 'yolo', 'diamond hands', 'hodl', 'tendies',
@@ -30,6 +46,10 @@ BEARISH_TERMS = {
     'overbought', 'weak', 'exit', 'sell off', 'panic', 'fear', 'loss'
 }
 
+# Frozen scan order for the sentiment inner loop (each check is a C-level substring search)
+_BULLISH_SCAN = tuple(BULLISH_TERMS)
+_BEARISH_SCAN = tuple(BEARISH_TERMS)
+
 @dataclass
 class SocialPost:
     """Represents a single social media post"""
@@ -44,6 +64,7 @@ class SocialPost:
     sentiment_score: float = 0.0
     bullish_terms: List[str] = field(default_factory=list)
     bearish_terms: List[str] = field(default_factory=list)
+    text_lower: Optional[str] = field(default=None, repr=False, compare=False)  # Cached at ingest
 
 @dataclass
 class TickerSentiment:
@@ -61,6 +82,55 @@ class TickerSentiment:
     sources: Dict[str, int] = field(default_factory=dict)
     hourly_mentions: List[int] = field(default_factory=list)
 
+@dataclass
+class TickerTimeline:
+    """Time-ordered post index for a ticker with running prefix sums.
+
+    Posts arriving in timestamp order are folded into the prefix sums in O(1);
+    out-of-order posts mark the timeline dirty and it is re-sorted once on the
+    next read. Any time window can then be summarized in O(log n).
+    """
+    timestamps: List[float] = field(default_factory=list)  # Epoch seconds, ascending
+    posts: List[SocialPost] = field(default_factory=list)
+    score_sums: List[float] = field(default_factory=lambda: [0.0])
+    weighted_sums: List[float] = field(default_factory=lambda: [0.0])
+    engagement_sums: List[float] = field(default_factory=lambda: [0.0])
+    dirty: bool = False
+
+    def append(self, post: SocialPost) -> None:
+        """Add a post, extending the running sums when it arrives in order"""
+        ts_s = post.timestamp.timestamp()
+        if self.timestamps and ts_s < self.timestamps[-1]:
+            self.dirty = True
+        self.timestamps.append(ts_s)
+        self.posts.append(post)
+        if not self.dirty:
+            self._accumulate(post)
+
+    def _accumulate(self, post: SocialPost) -> None:
+        engagement = post.upvotes + post.comments + 1
+        self.score_sums.append(self.score_sums[-1] + post.sentiment_score)
+        self.weighted_sums.append(self.weighted_sums[-1] + post.sentiment_score * engagement)
+        self.engagement_sums.append(self.engagement_sums[-1] + engagement)
+
+    def refresh(self) -> None:
+        """Re-sort and rebuild the running sums after out-of-order inserts"""
+        if not self.dirty:
+            return
+        order = sorted(range(len(self.posts)), key=self.timestamps.__getitem__)
+        self.timestamps = [self.timestamps[i] for i in order]
+        self.posts = [self.posts[i] for i in order]
+        self.score_sums = [0.0]
+        self.weighted_sums = [0.0]
+        self.engagement_sums = [0.0]
+        for post in self.posts:
+            self._accumulate(post)
+        self.dirty = False
+
+    def index_at(self, ts_s: float) -> int:
+        """Index of the first post at or after ts_s"""
+        return bisect_left(self.timestamps, ts_s)
+
 @dataclass
 class SentimentAlert:
     """Alert for significant sentiment events"""
@@ -80,22 +150,18 @@ class SocialSentimentAggregator:
         self.posts: List[SocialPost] = []
         self.ticker_data: Dict[str, TickerSentiment] = {}
         self.historical_sentiment: Dict[str, List[Tuple[datetime, float]]] = defaultdict(list)
+        self.timelines: Dict[str, TickerTimeline] = defaultdict(TickerTimeline)
+        self._posts_version = 0  # Bumped on every ingest; part of the _ticker_metrics cache key
+        self._metrics_cache: Optional[Tuple[Tuple[int, int, float], List[Dict]]] = None
         self.price_data: Dict[str, List[Tuple[datetime, float]]] = {}  # For correlation
         
-    def analyze_sentiment(self, text: str) -> Tuple[float, List[str], List[str]]:
+    def analyze_sentiment(self, text: str, text_lower: Optional[str] = None) -> Tuple[float, List[str], List[str]]:
         """Analyze sentiment of text, return score and matched terms"""
-        text_lower = text.lower()
-        
-        bullish_found = []
-        bearish_found = []
+        if text_lower is None:
+            text_lower = text.lower()
         
-        for term in BULLISH_TERMS:
-            if term in text_lower:
-                bullish_found.append(term)
-                
-        for term in BEARISH_TERMS:
-            if term in text_lower:
-                bearish_found.append(term)
+        bullish_found = [term for term in _BULLISH_SCAN if term in text_lower]
+        bearish_found = [term for term in _BEARISH_SCAN if term in text_lower]
         
         # Calculate score (-1 to 1)
         total = len(bullish_found) + len(bearish_found)
@@ -128,14 +194,18 @@ class SocialSentimentAggregator:
     
     def add_post(self, post: SocialPost) -> None:
         """Add a post and update sentiment data"""
+        if post.text_lower is None:
+            post.text_lower = post.text.lower()
+        
         # Analyze sentiment if not already done
         if post.sentiment_score == 0.0:
-            score, bullish, bearish = self.analyze_sentiment(post.text)
+            score, bullish, bearish = self.analyze_sentiment(post.text, post.text_lower)
             post.sentiment_score = score
             post.bullish_terms = bullish
             post.bearish_terms = bearish
         
         self.posts.append(post)
+        self._posts_version += 1
         
         # Update ticker aggregation
         ticker = post.ticker
@@ -157,36 +227,82 @@ class SocialSentimentAggregator:
         
         # Add to historical
         self.historical_sentiment[ticker].append((post.timestamp, post.sentiment_score))
-    
-    def calculate_aggregates(self, ticker: str, hours: int = 24) -> TickerSentiment:
-        """Calculate aggregate sentiment metrics for a ticker"""
+        self.timelines[ticker].append(post)
+    
+    def add_posts(self, posts: List[SocialPost]) -> None:
+        """Add a batch of posts, updating each ticker's data once"""
+        analyze = self.analyze_sentiment
+        by_ticker: Dict[str, List[SocialPost]] = defaultdict(list)
+        
+        for post in posts:
+            if post.text_lower is None:
+                post.text_lower = post.text.lower()
+            if post.sentiment_score == 0.0:
+                post.sentiment_score, post.bullish_terms, post.bearish_terms = analyze(post.text, post.text_lower)
+            by_ticker[post.ticker].append(post)
+        
+        self.posts.extend(posts)
+        self._posts_version += 1
+        
+        for ticker, ticker_posts in by_ticker.items():
+            if ticker not in self.ticker_data:
+                self.ticker_data[ticker] = TickerSentiment(ticker=ticker)
+            
+            ts = self.ticker_data[ticker]
+            ts.mention_count += len(ticker_posts)
+            
+            for post in ticker_posts:
+                if post.sentiment_score > 0.1:
+                    ts.bullish_count += 1
+                elif post.sentiment_score < -0.1:
+                    ts.bearish_count += 1
+                else:
+                    ts.neutral_count += 1
+                ts.sources[post.source] = ts.sources.get(post.source, 0) + 1
+            
+            # Time-ordered batches extend the timeline without a re-sort
+            ticker_posts.sort(key=lambda p: p.timestamp)
+            self.historical_sentiment[ticker].extend((p.timestamp, p.sentiment_score) for p in ticker_posts)
+            timeline = self.timelines[ticker]
+            for post in ticker_posts:
+                timeline.append(post)
+    
+    def calculate_aggregates(self, ticker: str, hours: int = 24,
+                             now_s: Optional[float] = None) -> TickerSentiment:
+        """Calculate aggregate sentiment metrics for a ticker (window ending at now_s, default the current time)"""
         if ticker not in self.ticker_data:
             return TickerSentiment(ticker=ticker)
         
         ts = self.ticker_data[ticker]
-        cutoff = datetime.now() - timedelta(hours=hours)
+        timeline = self.timelines[ticker]
+        timeline.refresh()
+        
+        if now_s is None:
+            now_s = datetime.now().timestamp()
+        window_s = hours * 3600
+        cutoff_s = now_s - window_s
         
-        # Get recent posts
-        recent_posts = [p for p in self.posts 
-                       if p.ticker == ticker and p.timestamp >= cutoff]
+        # Recent posts are the tail of the time-ordered timeline
+        lo = timeline.index_at(cutoff_s)
+        hi = len(timeline.posts)
+        count = hi - lo
         
-        if not recent_posts:
+        if count == 0:
             return ts
         
         # Average sentiment
-        scores = [p.sentiment_score for p in recent_posts]
-        ts.avg_sentiment = sum(scores) / len(scores) if scores else 0
+        ts.avg_sentiment = (timeline.score_sums[hi] - timeline.score_sums[lo]) / count
         
         # Weighted by engagement
-        total_engagement = sum(p.upvotes + p.comments + 1 for p in recent_posts)
-        weighted_sum = sum(p.sentiment_score * (p.upvotes + p.comments + 1) for p in recent_posts)
+        total_engagement = timeline.engagement_sums[hi] - timeline.engagement_sums[lo]
+        weighted_sum = timeline.weighted_sums[hi] - timeline.weighted_sums[lo]
         ts.weighted_sentiment = weighted_sum / total_engagement if total_engagement > 0 else 0
         
         # Velocity (mentions per hour)
-        ts.mention_velocity = len(recent_posts) / hours
+        ts.mention_velocity = count / hours
         
         # Top posts by engagement
-        sorted_posts = sorted(recent_posts, key=lambda p: p.upvotes + p.comments, reverse=True)
+        top = heapq.nlargest(5, timeline.posts[lo:hi], key=lambda p: p.upvotes + p.comments)
         ts.top_posts = [
             {
                 'text': p.text[:200],
@@ -195,22 +311,26 @@ class SocialSentimentAggregator:
                 'upvotes': p.upvotes,
                 'author': p.author
             }
-            for p in sorted_posts[:5]
+            for p in top
         ]
         
-        # Hourly breakdown
-        hourly = defaultdict(int)
-        for p in recent_posts:
-            hour_key = p.timestamp.replace(minute=0, second=0, microsecond=0)
-            hourly[hour_key] += 1
-        ts.hourly_mentions = list(hourly.values())[-24:] if hourly else []
+        # Hourly breakdown (non-empty hours, oldest first)
+        hourly = []
+        hour_start = cutoff_s - cutoff_s % 3600
+        prev = lo
+        while prev < hi:
+            hour_start += 3600
+            nxt = timeline.index_at(hour_start)
+            if nxt > prev:
+                hourly.append(nxt - prev)
+            prev = nxt
+        ts.hourly_mentions = hourly[-24:]
         
         # Sentiment momentum (compare to prior period)
-        prior_cutoff = cutoff - timedelta(hours=hours)
-        prior_posts = [p for p in self.posts 
-                      if p.ticker == ticker and prior_cutoff <= p.timestamp < cutoff]
-        if prior_posts:
-            prior_avg = sum(p.sentiment_score for p in prior_posts) / len(prior_posts)
+        prior_lo = timeline.index_at(cutoff_s - window_s)
+        prior_count = lo - prior_lo
+        if prior_count:
+            prior_avg = (timeline.score_sums[lo] - timeline.score_sums[prior_lo]) / prior_count
             ts.sentiment_momentum = ts.avg_sentiment - prior_avg
         
         return ts
@@ -319,62 +439,61 @@ class SocialSentimentAggregator:
         
         return alerts
     
+    def _ticker_metrics(self, hours: int = 24) -> List[Dict]:
+        """Aggregate metrics for every ticker, computed once per refresh"""
+        # Every ticker is aggregated over the same window, ending at the current whole
+        # second; the result is reused until new posts arrive or that second passes
+        now_s = float(int(datetime.now().timestamp()))
+        key = (hours, self._posts_version, now_s)
+        if self._metrics_cache is not None and self._metrics_cache[0] == key:
+            return self._metrics_cache[1]
+        
+        metrics = []
+        for ticker in self.ticker_data:
+            ts = self.calculate_aggregates(ticker, hours=hours, now_s=now_s)
+            mentions = ts.mention_count
+            metrics.append({
+                'ticker': ticker,
+                'mentions': mentions,
+                'velocity': ts.mention_velocity,
+                'sentiment': ts.weighted_sentiment,
+                'momentum': ts.sentiment_momentum,
+                'bullish_pct': ts.bullish_count / mentions if mentions > 0 else 0,
+                'bearish_pct': ts.bearish_count / mentions if mentions > 0 else 0,
+                'sources': ts.sources
+            })
+        
+        self._metrics_cache = (key, metrics)
+        return metrics
+    
     def get_trending(self, hours: int = 24, limit: int = 10) -> List[Dict]:
         """Get trending tickers by mention velocity"""
-        trending = []
+        candidates = (m for m in self._ticker_metrics(hours) if m['mentions'] >= 5)  # Minimum threshold
         
-        for ticker in self.ticker_data:
-            ts = self.calculate_aggregates(ticker, hours=hours)
-            if ts.mention_count >= 5:  # Minimum threshold
-                trending.append({
-                    'ticker': ticker,
-                    'mentions': ts.mention_count,
-                    'velocity': ts.mention_velocity,
-                    'sentiment': ts.weighted_sentiment,
-                    'momentum': ts.sentiment_momentum,
-                    'bullish_pct': ts.bullish_count / ts.mention_count if ts.mention_count > 0 else 0,
-                    'sources': ts.sources
-                })
-        
-        # Sort by velocity
-        trending.sort(key=lambda x: x['velocity'], reverse=True)
-        return trending[:limit]
+        # Top by velocity
+        return [
+            {k: m[k] for k in ('ticker', 'mentions', 'velocity', 'sentiment',
+                               'momentum', 'bullish_pct', 'sources')}
+            for m in heapq.nlargest(limit, candidates, key=lambda x: x['velocity'])
+        ]
     
     def get_most_bullish(self, hours: int = 24, min_mentions: int = 5, limit: int = 10) -> List[Dict]:
         """Get most bullish tickers"""
-        results = []
+        candidates = (m for m in self._ticker_metrics(hours) if m['mentions'] >= min_mentions)
         
-        for ticker in self.ticker_data:
-            ts = self.calculate_aggregates(ticker, hours=hours)
-            if ts.mention_count >= min_mentions:
-                results.append({
-                    'ticker': ticker,
-                    'sentiment': ts.weighted_sentiment,
-                    'mentions': ts.mention_count,
-                    'bullish_pct': ts.bullish_count / ts.mention_count,
-                    'momentum': ts.sentiment_momentum
-                })
-        
-        results.sort(key=lambda x: x['sentiment'], reverse=True)
-        return results[:limit]
+        return [
+            {k: m[k] for k in ('ticker', 'sentiment', 'mentions', 'bullish_pct', 'momentum')}
+            for m in heapq.nlargest(limit, candidates, key=lambda x: x['sentiment'])
+        ]
     
     def get_most_bearish(self, hours: int = 24, min_mentions: int = 5, limit: int = 10) -> List[Dict]:
         """Get most bearish tickers"""
-        results = []
+        candidates = (m for m in self._ticker_metrics(hours) if m['mentions'] >= min_mentions)
         
-        for ticker in self.ticker_data:
-            ts = self.calculate_aggregates(ticker, hours=hours)
-            if ts.mention_count >= min_mentions:
-                results.append({
-                    'ticker': ticker,
-                    'sentiment': ts.weighted_sentiment,
-                    'mentions': ts.mention_count,
-                    'bearish_pct': ts.bearish_count / ts.mention_count,
-                    'momentum': ts.sentiment_momentum
-                })
-        
-        results.sort(key=lambda x: x['sentiment'])
-        return results[:limit]
+        return [
+            {k: m[k] for k in ('ticker', 'sentiment', 'mentions', 'bearish_pct', 'momentum')}
+            for m in heapq.nsmallest(limit, candidates, key=lambda x: x['sentiment'])
+        ]
     
     def calculate_correlation(self, ticker: str, price_changes: List[float], 
                             sentiment_changes: List[float]) -> float:
@@ -382,6 +501,16 @@ class SocialSentimentAggregator:
         if len(price_changes) != len(sentiment_changes) or len(price_changes) < 5:
             return 0.0
         
+        if HAS_NUMPY:
+            p = np.asarray(price_changes, dtype=np.float64)
+            s = np.asarray(sentiment_changes, dtype=np.float64)
+            p = p - p.mean()
+            s = s - s.mean()
+            denominator = math.sqrt(float(np.dot(p, p)) * float(np.dot(s, s)))
+            if denominator == 0:
+                return 0.0
+            return float(np.dot(p, s)) / denominator
+        
         n = len(price_changes)
         
         # Calculate means
@@ -447,57 +576,88 @@ class SocialSentimentAggregator:
             'GME': 3.0, 'TSLA': 2.5, 'NVDA': 2.0, 'SPY': 1.5
         }
         
+        # Determine sentiment (with some ticker bias)
+        ticker_bias = {
+            'GME': 0.4, 'AMC': 0.3, 'TSLA': 0.2, 'NVDA': 0.3,
+            'PLTR': 0.1, 'SPY': 0.0, 'AAPL': 0.1
+        }
+        
+        weights = [ticker_weights.get(t, 1.0) for t in tickers]
+        biases = [ticker_bias.get(t, 0.0) for t in tickers]
+        
+        # Draw every random field for all posts up front
+        if HAS_NUMPY:
+            rng = np.random.default_rng()
+            p = np.array(weights)
+            ticker_idx = rng.choice(len(tickers), size=num_posts, p=p / p.sum())
+            sentiment_rolls = (rng.random(num_posts) + np.array(biases)[ticker_idx]).tolist()
+            ticker_idx = ticker_idx.tolist()
+            template_picks = rng.random(num_posts).tolist()
+            hours_ago = (rng.random(num_posts) * 48).tolist()
+            source_idx = rng.integers(0, len(sources), num_posts).tolist()
+            author_ids = rng.integers(1000, 10000, num_posts).tolist()
+            upvotes = np.where(rng.random(num_posts) > 0.7,
+                               rng.integers(1, 501, num_posts),
+                               rng.integers(1, 51, num_posts)).tolist()
+            comments = rng.integers(0, 101, num_posts).tolist()
+        else:
+            ticker_idx = random.choices(range(len(tickers)), weights=weights, k=num_posts)
+            sentiment_rolls = [random.random() + biases[t] for t in ticker_idx]
+            template_picks = [random.random() for _ in range(num_posts)]
+            hours_ago = [random.random() * 48 for _ in range(num_posts)]
+            source_idx = [random.randrange(len(sources)) for _ in range(num_posts)]
+            author_ids = [random.randint(1000, 9999) for _ in range(num_posts)]
+            upvotes = [random.randint(1, 500) if random.random() > 0.7 else random.randint(1, 50)
+                       for _ in range(num_posts)]
+            comments = [random.randint(0, 100) for _ in range(num_posts)]
+        
+        # Sample texts repeat heavily, so analyze each distinct text once
+        analyzed = {}
+        posts = []
+        
         for i in range(num_posts):
-            # Weighted ticker selection
-            weights = [ticker_weights.get(t, 1.0) for t in tickers]
-            total_weight = sum(weights)
-            r = random.random() * total_weight
-            cumulative = 0
-            ticker = tickers[0]
-            for t, w in zip(tickers, weights):
-                cumulative += w
-                if r <= cumulative:
-                    ticker = t
-                    break
-            
-            # Determine sentiment (with some ticker bias)
-            ticker_bias = {
-                'GME': 0.4, 'AMC': 0.3, 'TSLA': 0.2, 'NVDA': 0.3,
-                'PLTR': 0.1, 'SPY': 0.0, 'AAPL': 0.1
-            }
-            bias = ticker_bias.get(ticker, 0.0)
-            sentiment_roll = random.random() + bias
+            ticker = tickers[ticker_idx[i]]
+            sentiment_roll = sentiment_rolls[i]
             
             if sentiment_roll > 0.7:
-                template = random.choice(bullish_templates)
+                templates = bullish_templates
             elif sentiment_roll < 0.3:
-                template = random.choice(bearish_templates)
+                templates = bearish_templates
             else:
-                template = random.choice(neutral_templates)
-            
-            text = template.format(ticker=ticker)
+                templates = neutral_templates
             
-            # Random timestamp within 48 hours
-            hours_ago = random.random() * 48
-            timestamp = base_time - timedelta(hours=hours_ago)
+            text = templates[int(template_picks[i] * len(templates))].format(ticker=ticker)
+            if text not in analyzed:
+                text_lower = text.lower()
+                analyzed[text] = (text_lower, self.analyze_sentiment(text, text_lower))
+            text_lower, (score, bullish, bearish) = analyzed[text]
             
             # Create post
-            source = random.choice(sources)
             post = SocialPost(
                 id=f"post_{i}",
-                source=source,
+                source=sources[source_idx[i]],
                 ticker=ticker,
                 text=text,
-                timestamp=timestamp,
-                author=f"user_{random.randint(1000, 9999)}",
-                upvotes=random.randint(1, 500) if random.random() > 0.7 else random.randint(1, 50),
-                comments=random.randint(0, 100)
+                timestamp=base_time - timedelta(hours=hours_ago[i]),
+                author=f"user_{author_ids[i]}",
+                upvotes=upvotes[i],
+                comments=comments[i],
+                sentiment_score=score,
+                bullish_terms=list(bullish),
+                bearish_terms=list(bearish),
+                text_lower=text_lower
             )
-            
-            self.add_post(post)
+            posts.append(post)
+        
+        self.add_posts(posts)
     
-    def get_ticker_summary(self, ticker: str) -> Dict:
-        """Get comprehensive summary for a ticker"""
+    def get_ticker_summary(self, ticker: str,
+                           precomputed_alerts: Optional[List[SentimentAlert]] = None) -> Dict:
+        """Get comprehensive summary for a ticker
+
+        Pass precomputed_alerts (this ticker's alerts) to skip the alert scan
+        when summarizing many tickers at once.
+        """
         ts = self.calculate_aggregates(ticker, hours=24)
         
         # Determine sentiment label
@@ -509,7 +669,10 @@ class SocialSentimentAggregator:
             sentiment_label = 'NEUTRAL'
         
         # Check for alerts
-        alerts = self.get_all_alerts([ticker])
+        if precomputed_alerts is None:
+            alerts = self.get_all_alerts([ticker])
+        else:
+            alerts = precomputed_alerts
         
         return {
             'ticker': ticker,
@@ -528,26 +691,42 @@ class SocialSentimentAggregator:
             'hourly_trend': ts.hourly_mentions[-12:] if ts.hourly_mentions else []
         }
     
+    def get_alerts_by_ticker(self, tickers: List[str] = None) -> Dict[str, List[SentimentAlert]]:
+        """Run the alert scan once and group the results by ticker"""
+        alerts_by_ticker = defaultdict(list)
+        for alert in self.get_all_alerts(tickers):
+            alerts_by_ticker[alert.ticker].append(alert)
+        return alerts_by_ticker
+    
     def save_data(self, filename: str = "sentiment_data.json") -> None:
         """Save sentiment data to file"""
         filepath = os.path.join(self.data_dir, filename)
+        alerts_by_ticker = self.get_alerts_by_ticker()
         
         data = {
             'timestamp': datetime.now().isoformat(),
             'post_count': len(self.posts),
             'tickers_tracked': list(self.ticker_data.keys()),
-            'summaries': {ticker: self.get_ticker_summary(ticker) 
+            'summaries': {ticker: self.get_ticker_summary(ticker, alerts_by_ticker[ticker])
                          for ticker in self.ticker_data}
         }
         
-        with open(filepath, 'w') as f:
-            json.dump(data, f, indent=2, default=str)
+        # Summaries hold only JSON-native types, so no default=str fallback is needed
+        if HAS_ORJSON:
+            with open(filepath, 'wb') as f:
+                f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+        else:
+            with open(filepath, 'w') as f:
+                json.dump(data, f, indent=2)
     
     def load_data(self, filename: str = "sentiment_data.json") -> Dict:
         """Load saved sentiment data"""
         filepath = os.path.join(self.data_dir, filename)
         
         if os.path.exists(filepath):
+            if HAS_ORJSON:
+                with open(filepath, 'rb') as f:
+                    return orjson.loads(f.read())
             with open(filepath, 'r') as f:
                 return json.load(f)
         return {}
@@ -604,6 +783,52 @@ def test_aggregation():
     
     print("[PASS] Aggregation tests")
 
+def test_incremental_aggregates():
+    """Test running-sum aggregates match a full recomputation"""
+    agg = SocialSentimentAggregator()
+    agg.generate_sample_data(num_posts=300)
+    cutoff = datetime.now() - timedelta(hours=24)
+    
+    for ticker in agg.ticker_data:
+        ts = agg.calculate_aggregates(ticker)
+        recent = [p for p in agg.posts if p.ticker == ticker and p.timestamp >= cutoff]
+        if not recent:
+            continue
+        expected_avg = sum(p.sentiment_score for p in recent) / len(recent)
+        engagement = sum(p.upvotes + p.comments + 1 for p in recent)
+        expected_weighted = sum(p.sentiment_score * (p.upvotes + p.comments + 1) for p in recent) / engagement
+        assert abs(ts.avg_sentiment - expected_avg) < 1e-9, f"Average mismatch for {ticker}"
+        assert abs(ts.weighted_sentiment - expected_weighted) < 1e-9, f"Weighted mismatch for {ticker}"
+        assert sum(ts.hourly_mentions) <= len(recent), f"Hourly mismatch for {ticker}"
+    
+    print("[PASS] Incremental aggregate tests")
+
+def test_batch_add_posts():
+    """Test batch ingest matches one-at-a-time ingest"""
+    source = SocialSentimentAggregator()
+    source.generate_sample_data(num_posts=200)
+    
+    single = SocialSentimentAggregator()
+    for post in source.posts:
+        single.add_post(post)
+    
+    batch = SocialSentimentAggregator()
+    batch.add_posts(source.posts)
+    
+    assert len(batch.posts) == len(single.posts), "Should ingest every post"
+    for ticker, ts in single.ticker_data.items():
+        other = batch.ticker_data[ticker]
+        assert (ts.mention_count, ts.bullish_count, ts.bearish_count, ts.neutral_count) == \
+            (other.mention_count, other.bullish_count, other.bearish_count, other.neutral_count), \
+            f"Counts mismatch for {ticker}"
+        assert ts.sources == other.sources, f"Sources mismatch for {ticker}"
+        agg_single = single.calculate_aggregates(ticker)
+        agg_batch = batch.calculate_aggregates(ticker)
+        assert abs(agg_single.weighted_sentiment - agg_batch.weighted_sentiment) < 1e-9, \
+            f"Aggregate mismatch for {ticker}"
+    
+    print("[PASS] Batch ingest tests")
+
 def test_trending():
     """Test trending detection"""
     agg = SocialSentimentAggregator()
@@ -629,6 +854,31 @@ def test_alerts():
     
     print("[PASS] Alert detection tests")
 
+def test_metrics_cache():
+    """Test ticker metrics are reused within a refresh and recomputed after new posts"""
+    agg = SocialSentimentAggregator()
+    agg.generate_sample_data(num_posts=200)
+    
+    metrics = agg._ticker_metrics()
+    key = agg._metrics_cache[0]
+    assert agg._ticker_metrics() is metrics or agg._metrics_cache[0] != key, \
+        "Should reuse metrics for the same window"
+    
+    now_s = agg._metrics_cache[0][2]
+    for m in agg._ticker_metrics():
+        ts = agg.calculate_aggregates(m['ticker'], now_s=now_s)
+        assert m['velocity'] == ts.mention_velocity, f"Velocity mismatch for {m['ticker']}"
+        assert m['sentiment'] == ts.weighted_sentiment, f"Sentiment mismatch for {m['ticker']}"
+    
+    ticker = metrics[0]['ticker']
+    before = {m['ticker']: m['mentions'] for m in agg._ticker_metrics()}[ticker]
+    agg.add_post(SocialPost(id='cache-test', source='reddit', text=f"${ticker} to the moon", ticker=ticker,
+                            timestamp=datetime.now(), author='tester', upvotes=1, comments=0))
+    after = {m['ticker']: m['mentions'] for m in agg._ticker_metrics()}[ticker]
+    assert after == before + 1, "New posts should invalidate cached metrics"
+    
+    print("[PASS] Metrics cache tests")
+
 def test_bullish_bearish():
     """Test bullish/bearish rankings"""
     agg = SocialSentimentAggregator()
@@ -652,10 +902,13 @@ def run_all_tests():
     test_sentiment_analysis()
     test_ticker_extraction()
     test_aggregation()
+    test_incremental_aggregates()
+    test_batch_add_posts()
     test_trending()
     test_alerts()
+    test_metrics_cache()
     test_bullish_bearish()
-    print("\n=== All 6 tests passed! ===\n")
+    print("\n=== All 9 tests passed! ===\n")
 
 if __name__ == "__main__":
     run_all_tests()
@@ -7,14 +7,24 @@ Usage:
     python screener_fetcher.py                    # Fetch default universe
     python screener_fetcher.py --sp500           # S&P 500 stocks
     python screener_fetcher.py AAPL MSFT GOOG   # Specific tickers
+    python screener_fetcher.py --no-cache        # Ignore cached fundamentals
+    python screener_fetcher.py --verbose         # One progress line per ticker
+    python screener_fetcher.py --quiet           # No progress or summary output
 """
 
+import argparse
+import asyncio
 import json
 import os
+import random
+import shutil
 import sys
+import threading
+import time
+from collections import Counter
 from datetime import datetime
 from pathlib import Path
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Optional
 
 try:
     import yfinance as yf
@@ -32,10 +42,48 @@ except ImportError:
     subprocess.check_call([sys.executable, "-m", "pip", "install", "pandas", "-q"])
     import pandas as pd
 
+import numpy as np
+
+try:
+    from yfinance.exceptions import YFRateLimitError
+except ImportError:
+    # Older yfinance releases surface throttling only as HTTP 429 errors
+    YFRateLimitError = None
+
+# orjson is optional - faster C serializer that also handles numpy scalars
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+# uvloop is optional - faster event loop on Linux/macOS, default asyncio loop otherwise
+try:
+    import uvloop
+    HAS_UVLOOP = True
+except ImportError:
+    HAS_UVLOOP = False
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
 OUTPUT_FILE = Path(__file__).parent / 'stock_universe.json'
 
+# Max quote-summary requests in flight at once
+FETCH_CONCURRENCY = 20
+
+# Yahoo throttles bursts, so cap live quote-summary calls across all workers
+# (cache hits don't take a slot) and back off with jitter on HTTP 429
+YAHOO_SLOTS = threading.Semaphore(5)
+RATE_LIMIT_RETRIES = 4
+
+# Fundamentals rarely change intraday, so quote summaries are cached on disk
+CACHE_DIR = Path(__file__).parent / '.yf_cache'
+INFO_CACHE_TTL = 3600  # seconds
+
 # Default screening universe (mix of sectors)
-DEFAULT_UNIVERSE = [
+DEFAULT_UNIVERSE = (
     # Technology
     'AAPL', 'MSFT', 'GOOG', 'META', 'NVDA', 'AMZN', 'CRM', 'ORCL', 'ADBE', 'INTC', 
     'AMD', 'CSCO', 'AVGO', 'TXN', 'QCOM', 'IBM', 'NOW', 'INTU', 'AMAT', 'MU',
@@ -56,14 +104,180 @@ DEFAULT_UNIVERSE = [
     'NFLX', 'DIS', 'CMCSA', 'VZ', 'T', 'TMUS', 'CHTR',
     # Other
     'BRK-B', 'TSLA', 'NEE', 'DUK', 'SO',
-]
+)
+
+# S&P 500 proxy (simplified - top 100 of the default universe)
+SP100_UNIVERSE = DEFAULT_UNIVERSE[:100]
+
+
+def make_session() -> requests.Session:
+    """Create the keep-alive session shared by every Yahoo request in a run."""
+    session = requests.Session()
+    # Transient gateway errors are retried here; 429 is left to fetch_info's backoff,
+    # which releases its YAHOO_SLOTS slot while waiting
+    retries = Retry(total=3, backoff_factor=0.5, status_forcelist=[502, 503])
+    session.mount('https://', HTTPAdapter(pool_connections=FETCH_CONCURRENCY,
+                                          pool_maxsize=FETCH_CONCURRENCY,
+                                          max_retries=retries))
+    session.headers['Connection'] = 'keep-alive'
+    return session
+
+
+def load_cached_info(ticker: str) -> Optional[dict]:
+    """Return the cached quote summary for a ticker if it is still fresh."""
+    path = CACHE_DIR / f"{ticker}.json"
+    try:
+        if time.time() - path.stat().st_mtime < INFO_CACHE_TTL:
+            with open(path) as f:
+                return json.load(f)
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+def save_cached_info(ticker: str, info: dict) -> None:
+    """Cache a quote summary on disk (written atomically)."""
+    CACHE_DIR.mkdir(exist_ok=True)
+    tmp = CACHE_DIR / f"{ticker}.json.tmp"
+    with open(tmp, 'w') as f:
+        json.dump(info, f, default=str)
+    os.replace(tmp, CACHE_DIR / f"{ticker}.json")
+
+
+def clear_info_cache() -> None:
+    """Drop every cached quote summary."""
+    shutil.rmtree(CACHE_DIR, ignore_errors=True)
+
+
+def is_rate_limited(error: Exception) -> bool:
+    """True if a Yahoo request failed because we were rate limited."""
+    if YFRateLimitError is not None and isinstance(error, YFRateLimitError):
+        return True
+    response = getattr(error, 'response', None)
+    return getattr(response, 'status_code', None) == 429
+
+
+def fetch_info(ticker: str, session: requests.Session = None) -> dict:
+    """Fetch a ticker's quote summary, retrying with exponential backoff when throttled."""
+    for attempt in range(RATE_LIMIT_RETRIES):
+        try:
+            with YAHOO_SLOTS:
+                return yf.Ticker(ticker, session=session).info
+        except Exception as e:
+            if not is_rate_limited(e) or attempt == RATE_LIMIT_RETRIES - 1:
+                raise
+            time.sleep(2 ** attempt + random.random())
+
+
+def fetch_price_history(tickers: list, session: requests.Session = None) -> dict:
+    """Download one year of daily bars for all tickers in a single batched request.
+
+    Returns a dict of ticker -> OHLCV DataFrame (tickers with no bars are omitted).
+    """
+    try:
+        hist = yf.download(list(tickers), period='1y', group_by='ticker',
+                           threads=True, progress=False, session=session)
+    except Exception as e:
+        print(f"  ⚠️ Batch price download failed, falling back to per-ticker quotes: {e}")
+        return {}
+    
+    if hist is None or hist.empty:
+        return {}
+    
+    history = {}
+    for ticker in tickers:
+        if ticker not in hist.columns.get_level_values(0):
+            continue
+        bars = hist[ticker].dropna(subset=['Close'])
+        if not bars.empty:
+            history[ticker] = bars
+    return history
+
+
+def wilder_rsi(close: pd.Series, period: int = 14) -> float:
+    """Latest Wilder RSI of a close series (50 when there is too little history)."""
+    if len(close) <= period:
+        return 50.0
+    delta = close.diff()
+    avg_gain = delta.clip(lower=0).ewm(alpha=1 / period, adjust=False).mean().iloc[-1]
+    avg_loss = (-delta.clip(upper=0)).ewm(alpha=1 / period, adjust=False).mean().iloc[-1]
+    if avg_loss == 0:
+        return 100.0 if avg_gain > 0 else 50.0
+    return float(100 - 100 / (1 + avg_gain / avg_loss))
+
+
+def price_stats(bars: pd.DataFrame) -> dict:
+    """Price, moving averages, 52-week range and RSI(14) from daily bars."""
+    close = bars['Close']
+    return {
+        'price': float(close.iloc[-1]),
+        'fiftyTwoWeekHigh': float(bars['High'].max()),
+        'fiftyTwoWeekLow': float(bars['Low'].min()),
+        'fiftyDayAverage': float(close.tail(50).mean()),
+        'twoHundredDayAverage': float(close.tail(200).mean()),
+        'rsi': wilder_rsi(close),
+    }
+
 
+# Numeric quote-summary fields: (output key, Yahoo key, scale)
+INFO_FIELDS = (
+    # Valuation metrics
+    ('pe', 'trailingPE', 1),
+    ('forwardPE', 'forwardPE', 1),
+    ('peg', 'pegRatio', 1),
+    ('priceToBook', 'priceToBook', 1),
+    ('priceToSales', 'priceToSalesTrailing12Months', 1),
+    ('evToEbitda', 'enterpriseToEbitda', 1),
+    ('evToRevenue', 'enterpriseToRevenue', 1),
+    # Growth metrics
+    ('revenueGrowth', 'revenueGrowth', 100),
+    ('epsGrowth', 'earningsGrowth', 100),
+    ('earningsQuarterlyGrowth', 'earningsQuarterlyGrowth', 100),
+    # Profitability
+    ('grossMargin', 'grossMargins', 100),
+    ('operatingMargin', 'operatingMargins', 100),
+    ('netMargin', 'profitMargins', 100),
+    ('ebitdaMargin', 'ebitdaMargins', 100),
+    # Returns
+    ('roe', 'returnOnEquity', 100),
+    ('roa', 'returnOnAssets', 100),
+    # Income
+    ('dividendYield', 'dividendYield', 100),
+    ('payoutRatio', 'payoutRatio', 100),
+    # Balance Sheet
+    ('debtToEquity', 'debtToEquity', 1),
+    ('currentRatio', 'currentRatio', 1),
+    ('quickRatio', 'quickRatio', 1),
+    # Size
+    ('beta', 'beta', 1),
+    ('avgVolume', 'averageVolume', 1),
+    ('sharesOutstanding', 'sharesOutstanding', 1),
+    # Technical (simple)
+    ('fiftyTwoWeekHigh', 'fiftyTwoWeekHigh', 1),
+    ('fiftyTwoWeekLow', 'fiftyTwoWeekLow', 1),
+    ('fiftyDayAverage', 'fiftyDayAverage', 1),
+    ('twoHundredDayAverage', 'twoHundredDayAverage', 1),
+)
 
-def fetch_stock_data(ticker: str) -> dict:
-    """Fetch comprehensive stock data for screening."""
+
+def num(info: dict, key: str, scale: float = 1):
+    """Numeric quote-summary field; Yahoo reports missing values as None (or omits them)."""
+    value = info.get(key)
+    return value * scale if value else 0
+
+
+def fetch_stock_data(ticker: str, bars: pd.DataFrame = None,
+                     session: requests.Session = None, use_cache: bool = True) -> dict:
+    """Fetch comprehensive stock data for screening.
+
+    When `bars` (from fetch_price_history) is given, price-derived fields come
+    from it and only fundamentals are read from the quote summary.
+    """
     try:
-        stock = yf.Ticker(ticker)
-        info = stock.info
+        info = load_cached_info(ticker) if use_cache else None
+        if info is None:
+            info = fetch_info(ticker, session)
+            save_cached_info(ticker, info)
         
         # Basic info
         data = {
@@ -75,57 +289,13 @@ def fetch_stock_data(ticker: str) -> dict:
             'marketCap': info.get('marketCap', 0) or 0,
         }
         
-        # Valuation metrics
-        data['pe'] = info.get('trailingPE', 0) or 0
-        data['forwardPE'] = info.get('forwardPE', 0) or 0
-        data['peg'] = info.get('pegRatio', 0) or 0
-        data['priceToBook'] = info.get('priceToBook', 0) or 0
-        data['priceToSales'] = info.get('priceToSalesTrailing12Months', 0) or 0
-        data['evToEbitda'] = info.get('enterpriseToEbitda', 0) or 0
-        data['evToRevenue'] = info.get('enterpriseToRevenue', 0) or 0
-        
-        # Growth metrics
-        data['revenueGrowth'] = (info.get('revenueGrowth', 0) or 0) * 100
-        data['epsGrowth'] = (info.get('earningsGrowth', 0) or 0) * 100
-        data['earningsQuarterlyGrowth'] = (info.get('earningsQuarterlyGrowth', 0) or 0) * 100
-        
-        # Profitability
-        data['grossMargin'] = (info.get('grossMargins', 0) or 0) * 100
-        data['operatingMargin'] = (info.get('operatingMargins', 0) or 0) * 100
-        data['netMargin'] = (info.get('profitMargins', 0) or 0) * 100
-        data['ebitdaMargin'] = (info.get('ebitdaMargins', 0) or 0) * 100
+        data.update((key, num(info, src, scale)) for key, src, scale in INFO_FIELDS)
         
-        # Returns
-        data['roe'] = (info.get('returnOnEquity', 0) or 0) * 100
-        data['roa'] = (info.get('returnOnAssets', 0) or 0) * 100
+        # Neutral RSI unless we have bars to compute the real one
+        data['rsi'] = 50
         
-        # Income
-        data['dividendYield'] = (info.get('dividendYield', 0) or 0) * 100
-        data['payoutRatio'] = (info.get('payoutRatio', 0) or 0) * 100
-        
-        # Balance Sheet
-        data['debtToEquity'] = info.get('debtToEquity', 0) or 0
-        data['currentRatio'] = info.get('currentRatio', 0) or 0
-        data['quickRatio'] = info.get('quickRatio', 0) or 0
-        
-        # Size
-        data['beta'] = info.get('beta', 0) or 0
-        data['avgVolume'] = info.get('averageVolume', 0) or 0
-        data['sharesOutstanding'] = info.get('sharesOutstanding', 0) or 0
-        
-        # Technical (simple)
-        data['fiftyTwoWeekHigh'] = info.get('fiftyTwoWeekHigh', 0) or 0
-        data['fiftyTwoWeekLow'] = info.get('fiftyTwoWeekLow', 0) or 0
-        data['fiftyDayAverage'] = info.get('fiftyDayAverage', 0) or 0
-        data['twoHundredDayAverage'] = info.get('twoHundredDayAverage', 0) or 0
-        
-        # Calculate RSI approximation from recent price vs 50MA
-        if data['fiftyDayAverage'] > 0 and data['price'] > 0:
-            ratio = data['price'] / data['fiftyDayAverage']
-            # Rough RSI approximation (not exact)
-            data['rsi'] = min(100, max(0, 50 + (ratio - 1) * 100))
-        else:
-            data['rsi'] = 50
+        if bars is not None and not bars.empty:
+            data.update(price_stats(bars))
         
         return data
         
@@ -134,73 +304,153 @@ def fetch_stock_data(ticker: str) -> dict:
         return None
 
 
-def main():
-    # Parse arguments
-    if '--sp500' in sys.argv:
-        # Fetch S&P 500 list (simplified - top 100)
-        print("Fetching S&P 500 universe (top 100)...")
-        tickers = DEFAULT_UNIVERSE[:100]
-    elif len(sys.argv) > 1 and not sys.argv[1].startswith('--'):
-        tickers = [t.upper() for t in sys.argv[1:] if not t.startswith('--')]
-    else:
-        tickers = DEFAULT_UNIVERSE
+def to_columns(stocks: list) -> dict:
+    """Transpose per-stock records into one list per field, sorted by market cap (desc)."""
+    if not stocks:
+        return {}
+    order = np.argsort(-np.asarray([s['marketCap'] for s in stocks], dtype=float), kind='stable')
+    ordered = [stocks[i] for i in order]
+    return {key: [s.get(key) for s in ordered] for key in stocks[0]}
+
+
+class ProgressLine:
+    """Single self-overwriting progress line on stderr, redrawn at most ~10x per second."""
     
-    print(f"📊 Stock Screener Data Fetcher")
-    print(f"   Fetching {len(tickers)} stocks...")
-    print()
+    def __init__(self, total: int):
+        self.total = total
+        self.enabled = sys.stderr.isatty()
+        self.last_draw = 0.0
+    
+    def update(self, done: int, failed: int) -> None:
+        now = time.monotonic()
+        if not self.enabled or (done < self.total and now - self.last_draw < 0.1):
+            return
+        self.last_draw = now
+        sys.stderr.write(f"\r  [{done}/{self.total}] fetched, {failed} failed")
+        if done == self.total:
+            sys.stderr.write("\n")
+        sys.stderr.flush()
+
+
+async def fetch_universe(tickers: list, history: dict, session: requests.Session = None,
+                         use_cache: bool = True, verbose: bool = False, quiet: bool = False) -> tuple:
+    """Fetch fundamentals for all tickers concurrently.
+
+    yfinance is synchronous, so each fetch runs on a worker thread while the
+    event loop bounds how many are in flight. Progress is one line per ticker
+    when verbose, a single updating line by default, nothing when quiet.
+    Returns (stocks, errors).
+    """
+    sem = asyncio.Semaphore(FETCH_CONCURRENCY)
+    
+    async def fetch_one(ticker):
+        async with sem:
+            try:
+                return ticker, await asyncio.to_thread(fetch_stock_data, ticker, history.get(ticker),
+                                                       session, use_cache), None
+            except Exception as e:
+                return ticker, None, e
+    
+    async def results():
+        # Fetch the first ticker on its own so yfinance's cookie/crumb handshake
+        # happens once on the shared session before the other workers start
+        if tickers:
+            yield await fetch_one(tickers[0])
+        for pending in asyncio.as_completed([fetch_one(t) for t in tickers[1:]]):
+            yield await pending
     
     stocks = []
     errors = []
+    progress = ProgressLine(len(tickers)) if not (verbose or quiet) else None
     
-    # Use thread pool for parallel fetching
-    with ThreadPoolExecutor(max_workers=10) as executor:
-        futures = {executor.submit(fetch_stock_data, t): t for t in tickers}
+    i = 0
+    async for ticker, data, error in results():
+        i += 1
+        if data:
+            stocks.append(data)
+        else:
+            errors.append(ticker)
         
-        for i, future in enumerate(as_completed(futures), 1):
-            ticker = futures[future]
-            try:
-                data = future.result()
-                if data:
-                    stocks.append(data)
-                    print(f"  [{i}/{len(tickers)}] {ticker} ✅")
-                else:
-                    errors.append(ticker)
-                    print(f"  [{i}/{len(tickers)}] {ticker} ❌")
-            except Exception as e:
-                errors.append(ticker)
-                print(f"  [{i}/{len(tickers)}] {ticker} ❌ {e}")
+        if verbose:
+            status = "✅" if data else f"❌ {error}" if error else "❌"
+            print(f"  [{i}/{len(tickers)}] {ticker} {status}")
+        elif progress:
+            progress.update(i, len(errors))
+    
+    return stocks, errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fetch stock data for the screening universe")
+    parser.add_argument('tickers', nargs='*', help='Tickers to fetch (default: built-in universe)')
+    parser.add_argument('--sp500', action='store_true', help='S&P 500 stocks (simplified - top 100)')
+    parser.add_argument('--no-cache', action='store_true', help='Ignore cached fundamentals')
+    parser.add_argument('--verbose', action='store_true', help='One progress line per ticker')
+    parser.add_argument('--quiet', action='store_true', help='No progress or summary output')
+    args = parser.parse_args()
     
-    # Sort by market cap
-    stocks.sort(key=lambda x: x['marketCap'], reverse=True)
+    verbose = args.verbose and not args.quiet
+    log = (lambda *a, **k: None) if args.quiet else print
     
-    # Prepare output
+    if args.sp500:
+        log("Fetching S&P 500 universe (top 100)...")
+        tickers = SP100_UNIVERSE
+    elif args.tickers:
+        tickers = [t.upper() for t in args.tickers]
+    else:
+        tickers = DEFAULT_UNIVERSE
+    
+    log(f"📊 Stock Screener Data Fetcher")
+    log(f"   Fetching {len(tickers)} stocks...")
+    log()
+    
+    use_cache = not args.no_cache
+    if not use_cache:
+        clear_info_cache()
+    
+    # One pooled session so every request reuses keep-alive connections and
+    # the Yahoo cookie/crumb fetched for the first quote summary
+    session = make_session()
+    
+    # Prices and averages for the whole universe in one request
+    history = fetch_price_history(tickers, session)
+    
+    run = uvloop.run if HAS_UVLOOP else asyncio.run
+    stocks, errors = run(fetch_universe(tickers, history, session, use_cache,
+                                         verbose, args.quiet))
+    
+    # Prepare columnar output (largest market cap first)
+    columns = to_columns(stocks)
     output = {
         'lastUpdated': datetime.now().isoformat(),
         'stockCount': len(stocks),
         'errors': errors,
-        'stocks': stocks,
+        'schema': list(columns),
+        'columns': columns,
     }
     
-    # Save
-    with open(OUTPUT_FILE, 'w') as f:
-        json.dump(output, f, indent=2)
+    # Save (write to a temp file, then rename so readers never see a partial file)
+    tmp = OUTPUT_FILE.with_suffix('.json.tmp')
+    if HAS_ORJSON:
+        tmp.write_bytes(orjson.dumps(output, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY))
+    else:
+        with open(tmp, 'w') as f:
+            json.dump(output, f, indent=2)
+    tmp.replace(OUTPUT_FILE)
     
-    print()
-    print(f"✅ Complete! {len(stocks)} stocks saved to {OUTPUT_FILE}")
+    log()
+    log(f"✅ Complete! {len(stocks)} stocks saved to {OUTPUT_FILE}")
     
     if errors:
-        print(f"⚠️  Errors: {', '.join(errors)}")
+        log(f"⚠️  Errors: {', '.join(errors)}")
     
     # Print sector breakdown
-    sectors = {}
-    for s in stocks:
-        sector = s.get('sector', 'Unknown')
-        sectors[sector] = sectors.get(sector, 0) + 1
-    
-    print()
-    print("📊 Sector Breakdown:")
-    for sector, count in sorted(sectors.items(), key=lambda x: -x[1]):
-        print(f"   {sector}: {count}")
+    sectors = Counter(s.get('sector', 'Unknown') for s in stocks)
+    
+    log()
+    log("📊 Sector Breakdown:")
+    for sector, count in sectors.most_common():
+        log(f"   {sector}: {count}")
 
 
 if __name__ == '__main__':
@@ -8,20 +8,73 @@ import argparse
 import json
 import sys
 from datetime import datetime
+from functools import lru_cache
 from divergence import (
     DivergenceScanner, DivergenceType, IndicatorType, Strength,
-    generate_sample_data
+    generate_sample_data, partition_by_direction
 )
 
+# orjson is optional - faster C serializer, falls back to the stdlib json module
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+
+# Display lookups for scan output (confidence bins to 0-5 hashes)
+CONF_BARS = tuple("#" * n + "." * (5 - n) for n in range(6))
+STRENGTH_ICONS = {Strength.STRONG: "*", Strength.WEAK: "o"}
+
+
+def to_json(obj, indent: bool = True) -> str:
+    """Serialize obj to a JSON string (indented unless indent=False)."""
+    if HAS_ORJSON:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0).decode()
+    return json.dumps(obj, indent=2 if indent else None)
+
+
+def signal_record(s) -> dict:
+    """JSON-ready record for a divergence signal."""
+    return {
+        "ticker": s.ticker,
+        "type": s.divergence_type.value,
+        "indicator": s.indicator.value,
+        "strength": s.strength.value,
+        "confidence": s.confidence,
+        "price_start": s.price_start,
+        "price_end": s.price_end,
+        "timeframe": s.timeframe,
+        "detected_at": s.detected_at.isoformat()
+    }
+
+
+@lru_cache(maxsize=1)
+def _get_scanner() -> DivergenceScanner:
+    """Build the sample scanner once per process and share it across commands."""
+    return generate_sample_data()
+
 
 def format_pct(value: float) -> str:
     """Format percentage."""
     return f"{value:+.1f}%"
 
 
+def format_signal_block(s) -> str:
+    """Format one signal as a scan-output block (with trailing blank line)."""
+    strength_icon = STRENGTH_ICONS.get(s.strength, "-")
+    conf_bar = CONF_BARS[min(5, int(s.confidence * 5))]
+    return (
+        f"  {strength_icon} {s.ticker:<6} {s.indicator.value:<6} {s.divergence_type.value:<15}\n"
+        f"    Price: ${s.price_start:.2f} -> ${s.price_end:.2f} ({s.price_change_pct:+.1f}%)\n"
+        f"    Confidence: [{conf_bar}] {s.confidence:.0%} | Bars: {s.lookback_bars}\n"
+        f"\n"
+    )
+
+
 def cmd_scan(args):
     """Scan for divergences."""
-    scanner = generate_sample_data()
+    scanner = _get_scanner()
     
     if args.ticker:
         signals = [s for s in scanner.signals if s.ticker == args.ticker.upper()]
@@ -36,19 +89,15 @@ def cmd_scan(args):
     if args.strong:
         signals = [s for s in signals if s.strength == Strength.STRONG]
     
+    if args.ndjson:
+        # One compact record per line, written as produced
+        write = sys.stdout.write
+        for s in signals:
+            write(to_json(signal_record(s), indent=False) + "\n")
+        return
+    
     if args.json:
-        output = [{
-            "ticker": s.ticker,
-            "type": s.divergence_type.value,
-            "indicator": s.indicator.value,
-            "strength": s.strength.value,
-            "confidence": s.confidence,
-            "price_start": s.price_start,
-            "price_end": s.price_end,
-            "timeframe": s.timeframe,
-            "detected_at": s.detected_at.isoformat()
-        } for s in signals]
-        print(json.dumps(output, indent=2))
+        print(to_json([signal_record(s) for s in signals]))
         return
     
     print(f"\n{'='*70}")
@@ -59,36 +108,20 @@ def cmd_scan(args):
         print("  No divergences detected\n")
         return
     
-    bullish = [s for s in signals if s.is_bullish]
-    bearish = [s for s in signals if not s.is_bullish]
-    
-    if bullish:
-        print("  [+] BULLISH DIVERGENCES")
-        print(f"  {'-'*66}")
-        for s in bullish:
-            strength_icon = "*" if s.strength == Strength.STRONG else "o" if s.strength == Strength.WEAK else "-"
-            conf_bar = "#" * int(s.confidence * 5) + "." * (5 - int(s.confidence * 5))
-            print(f"  {strength_icon} {s.ticker:<6} {s.indicator.value:<6} {s.divergence_type.value:<15}")
-            print(f"    Price: ${s.price_start:.2f} -> ${s.price_end:.2f} ({s.price_change_pct:+.1f}%)")
-            print(f"    Confidence: [{conf_bar}] {s.confidence:.0%} | Bars: {s.lookback_bars}")
-            print()
-    
-    if bearish:
-        print("  [-] BEARISH DIVERGENCES")
-        print(f"  {'-'*66}")
-        for s in bearish:
-            strength_icon = "*" if s.strength == Strength.STRONG else "o" if s.strength == Strength.WEAK else "-"
-            conf_bar = "#" * int(s.confidence * 5) + "." * (5 - int(s.confidence * 5))
-            print(f"  {strength_icon} {s.ticker:<6} {s.indicator.value:<6} {s.divergence_type.value:<15}")
-            print(f"    Price: ${s.price_start:.2f} -> ${s.price_end:.2f} ({s.price_change_pct:+.1f}%)")
-            print(f"    Confidence: [{conf_bar}] {s.confidence:.0%} | Bars: {s.lookback_bars}")
-            print()
+    bullish, bearish = partition_by_direction(signals)
+    
+    for title, group in (("  [+] BULLISH DIVERGENCES", bullish), ("  [-] BEARISH DIVERGENCES", bearish)):
+        if group:
+            # Build the whole section and write it once
+            parts = [f"{title}\n  {'-'*66}\n"]
+            parts.extend(format_signal_block(s) for s in group)
+            sys.stdout.write("".join(parts))
 
 
 def cmd_alerts(args):
     """Show recent divergence alerts."""
-    scanner = generate_sample_data()
-    signals = scanner.get_recent_signals(hours=args.hours)
+    scanner = _get_scanner()
+    signals = scanner.get_recent_signals(hours=args.hours)[:args.limit]
     
     if args.json:
         output = [{
@@ -98,8 +131,8 @@ def cmd_alerts(args):
             "strength": s.strength.value,
             "confidence": s.confidence,
             "detected_at": s.detected_at.isoformat()
-        } for s in signals[:args.limit]]
-        print(json.dumps(output, indent=2))
+        } for s in signals]
+        print(to_json(output))
         return
     
     print(f"\n{'='*70}")
@@ -110,7 +143,7 @@ def cmd_alerts(args):
         print("  No recent alerts\n")
         return
     
-    for s in signals[:args.limit]:
+    for s in signals:
         emoji = "[UP]" if s.is_bullish else "[DN]"
         strength_emoji = "*" if s.strength == Strength.STRONG else "-"
         time_str = s.detected_at.strftime("%H:%M")
@@ -122,7 +155,7 @@ def cmd_alerts(args):
 
 def cmd_accuracy(args):
     """Show historical accuracy statistics."""
-    scanner = generate_sample_data()
+    scanner = _get_scanner()
     
     indicator = None
     if args.indicator:
@@ -134,7 +167,7 @@ def cmd_accuracy(args):
     stats = scanner.get_accuracy_stats(indicator)
     
     if args.json:
-        print(json.dumps(stats, indent=2, default=str))
+        print(to_json(stats))
         return
     
     print(f"\n{'='*60}")
@@ -173,11 +206,11 @@ def cmd_accuracy(args):
 
 def cmd_summary(args):
     """Show signal summary."""
-    scanner = generate_sample_data()
+    scanner = _get_scanner()
     summary = scanner.get_signal_summary()
     
     if args.json:
-        print(json.dumps(summary, indent=2, default=str))
+        print(to_json(summary))
         return
     
     print(f"\n{'='*60}")
@@ -206,7 +239,7 @@ def cmd_summary(args):
 
 def cmd_watch(args):
     """Manage watchlist."""
-    scanner = generate_sample_data()
+    scanner = _get_scanner()
     
     if args.action == "list":
         if args.json:
@@ -231,33 +264,22 @@ def cmd_watch(args):
 
 def cmd_export(args):
     """Export divergence data."""
-    scanner = generate_sample_data()
+    scanner = _get_scanner()
+    stats = scanner.compute_all_stats()
     
     data = {
         "exported_at": datetime.now().isoformat(),
-        "summary": scanner.get_signal_summary(),
-        "accuracy": scanner.get_accuracy_stats(),
-        "recent_signals": [
-            {
-                "ticker": s.ticker,
-                "type": s.divergence_type.value,
-                "indicator": s.indicator.value,
-                "strength": s.strength.value,
-                "confidence": s.confidence,
-                "price_start": s.price_start,
-                "price_end": s.price_end,
-                "detected_at": s.detected_at.isoformat()
-            }
-            for s in scanner.get_recent_signals(hours=72)
-        ]
+        "summary": stats["summary"],
+        "accuracy": stats["accuracy"],
+        "recent_signals": [signal_record(s) for s in scanner.get_recent_signals(hours=72)]
     }
     
     if args.output:
         with open(args.output, 'w') as f:
-            json.dump(data, f, indent=2, default=str)
+            f.write(to_json(data))
         print(f"Exported to {args.output}")
     else:
-        print(json.dumps(data, indent=2, default=str))
+        print(to_json(data))
 
 
 def main():
@@ -275,6 +297,7 @@ def main():
     p_scan.add_argument('--bearish', action='store_true', help='Only bearish')
     p_scan.add_argument('--strong', action='store_true', help='Only strong signals')
     p_scan.add_argument('--json', action='store_true', help='JSON output')
+    p_scan.add_argument('--ndjson', action='store_true', help='Newline-delimited JSON output (one signal per line)')
     p_scan.set_defaults(func=cmd_scan)
     
     # Alerts command
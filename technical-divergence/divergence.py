@@ -4,14 +4,40 @@ Detect price vs indicator divergences (RSI, MACD, OBV).
 Alert on bullish/bearish divergences with historical accuracy tracking.
 """
 
+import importlib.util
 import json
+from array import array
+from bisect import bisect_left
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta
-from dataclasses import dataclass, asdict
-from typing import List, Dict, Optional, Tuple
+from dataclasses import dataclass, field, asdict
+from typing import Iterable, List, Dict, Optional, Tuple, Union
 from enum import Enum
+from functools import lru_cache
+from itertools import accumulate
 import random
 import math
 
+# NumPy is optional - vectorized indicator paths fall back to pure Python without it
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+# SciPy is optional - runs EMA recurrences as a C-level IIR filter on very long inputs.
+# scipy.signal takes over a second to import, so it is only imported once an input is
+# large enough (LFILTER_MIN_BARS) to pay that back
+HAS_SCIPY = HAS_NUMPY and importlib.util.find_spec("scipy") is not None
+LFILTER_MIN_BARS = 1_000_000
+
+# Numba is optional - compiles the indicator loops to machine code for very long series.
+# numba takes ~0.3s to import (plus JIT or cache-load time), so it is only imported once
+# a series reaches NUMBA_MIN_BARS; shorter series stay on the NumPy/Python paths
+HAS_NUMBA = HAS_NUMPY and importlib.util.find_spec("numba") is not None
+NUMBA_MIN_BARS = 50_000
+
 
 class DivergenceType(Enum):
     BULLISH = "bullish"      # Price lower low, indicator higher low
@@ -29,13 +55,17 @@ class IndicatorType(Enum):
     CCI = "CCI"
 
 
+# Small-int code per indicator (its definition order), for list-indexed tallies
+_INDICATOR_CODE = {indicator: code for code, indicator in enumerate(IndicatorType)}
+
+
 class Strength(Enum):
     WEAK = "weak"
     MODERATE = "moderate"
     STRONG = "strong"
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class PriceData:
     """OHLCV price data."""
     date: str
@@ -47,6 +77,52 @@ class PriceData:
 
 
 @dataclass
+class OHLCVFrame:
+    """Column-oriented OHLCV history for one ticker.
+
+    Each price column is a contiguous typed array, so indicators read closes
+    and volumes directly (NumPy wraps them without copying) instead of
+    gathering them out of PriceData objects on every scan.
+    """
+    dates: List[str] = field(default_factory=list)
+    opens: array = field(default_factory=lambda: array('d'))
+    highs: array = field(default_factory=lambda: array('d'))
+    lows: array = field(default_factory=lambda: array('d'))
+    closes: array = field(default_factory=lambda: array('d'))
+    volumes: array = field(default_factory=lambda: array('q'))
+    
+    @classmethod
+    def from_bars(cls, bars: Iterable[PriceData]) -> "OHLCVFrame":
+        frame = cls()
+        frame.extend(bars)
+        return frame
+    
+    def __len__(self) -> int:
+        return len(self.dates)
+    
+    def append(self, bar: PriceData):
+        self.dates.append(bar.date)
+        self.opens.append(bar.open)
+        self.highs.append(bar.high)
+        self.lows.append(bar.low)
+        self.closes.append(bar.close)
+        self.volumes.append(bar.volume)
+    
+    def extend(self, bars: Iterable[PriceData]):
+        for bar in bars:
+            self.append(bar)
+    
+    def bar(self, i: int) -> PriceData:
+        """Row i as a PriceData."""
+        return PriceData(self.dates[i], self.opens[i], self.highs[i], self.lows[i],
+                         self.closes[i], self.volumes[i])
+    
+    def bars(self) -> List[PriceData]:
+        """All rows as PriceData (for callers that want records)."""
+        return [self.bar(i) for i in range(len(self))]
+
+
+@dataclass(slots=True, frozen=True)
 class DivergenceSignal:
     """A detected divergence signal."""
     ticker: str
@@ -75,7 +151,15 @@ class DivergenceSignal:
         return f"{direction} {self.ticker}: {self.divergence_type.value} {self.indicator.value} divergence ({self.strength.value})"
 
 
-@dataclass
+def partition_by_direction(signals: List[DivergenceSignal]) -> Tuple[List[DivergenceSignal], List[DivergenceSignal]]:
+    """Split signals into (bullish, bearish) in a single pass."""
+    bullish, bearish = [], []
+    for s in signals:
+        (bullish if s.is_bullish else bearish).append(s)
+    return bullish, bearish
+
+
+@dataclass(slots=True)
 class DivergenceOutcome:
     """Track historical accuracy of divergence signals."""
     signal: DivergenceSignal
@@ -85,6 +169,170 @@ class DivergenceOutcome:
     success: bool  # Did the divergence correctly predict direction?
 
 
+def _rsi_loop(prices, period):
+    """RSI over a sliding window of `period` price changes (one value per full window)."""
+    n = len(prices) - 1
+    out = np.empty(n - period + 1)
+    gain_sum = 0.0
+    loss_sum = 0.0
+    down_bars = 0
+    for i in range(1, n + 1):
+        delta = prices[i] - prices[i - 1]
+        if delta > 0:
+            gain_sum += delta
+        elif delta < 0:
+            loss_sum -= delta
+            down_bars += 1
+        if i > period:
+            old = prices[i - period] - prices[i - period - 1]
+            if old > 0:
+                gain_sum -= old
+            elif old < 0:
+                loss_sum += old
+                down_bars -= 1
+        if i >= period:
+            out[i - period] = 100.0 if down_bars == 0 else 100 - 100 / (1 + gain_sum / loss_sum)
+    return out
+
+
+def _ema_loop(data, period):
+    """EMA seeded with the SMA of the first `period` values."""
+    multiplier = 2 / (period + 1)
+    out = np.empty(len(data) - period + 1)
+    out[0] = data[:period].sum() / period
+    for i in range(period, len(data)):
+        out[i - period + 1] = data[i] * multiplier + out[i - period] * (1 - multiplier)
+    return out
+
+
+@lru_cache(maxsize=None)
+def _jit(func):
+    """func compiled with numba.njit (cached on disk); numba is imported on first use."""
+    from numba import njit
+    return njit(cache=True)(func)
+
+
+def _obv_loop(prices, volumes):
+    """On-Balance Volume, in the dtype of `volumes`."""
+    out = np.zeros(len(prices), dtype=volumes.dtype)
+    for i in range(1, len(prices)):
+        if prices[i] > prices[i - 1]:
+            out[i] = out[i - 1] + volumes[i]
+        elif prices[i] < prices[i - 1]:
+            out[i] = out[i - 1] - volumes[i]
+        else:
+            out[i] = out[i - 1]
+    return out
+
+
+def _block_maxima(arr, window: int) -> List[int]:
+    """Indices strictly greater than every neighbour within `window` (edges excluded).
+
+    Matrix-reshape variant of the sliding window: view the series as rows of
+    window+1 values and take one argmax per row. Any block of window+1 bars
+    holding a true local max lies inside that max's +/-window neighbourhood,
+    so the max wins its row; checking only the row winners is O(N) instead
+    of O(N*window). (Rows of the full 2*window+1 width, as in the
+    MassSpecWavelet original, can miss maxima near row edges and need a
+    second half-shifted pass.)
+    """
+    n = len(arr)
+    if n <= 2 * window:
+        return []
+    block = window + 1
+    padded = np.full(-(-n // block) * block, -np.inf)
+    padded[:n] = arr
+    candidates = padded.reshape(-1, block).argmax(axis=1) + np.arange(0, len(padded), block)
+    candidates = candidates[(candidates >= window) & (candidates < n - window)]
+    
+    offsets = np.concatenate((np.arange(-window, 0), np.arange(1, window + 1)))
+    is_max = (arr[candidates, None] > arr[candidates[:, None] + offsets]).all(axis=1)
+    return candidates[is_max].tolist()
+
+
+@lru_cache(maxsize=32)
+def _ema_coeffs(period: int) -> Tuple[float, float]:
+    """(multiplier, 1 - multiplier) for an EMA of the given period."""
+    multiplier = 2 / (period + 1)
+    return multiplier, 1 - multiplier
+
+
+@lru_cache(maxsize=32)
+def _ema_filter(period: int) -> Tuple[Tuple[float], Tuple[float, float]]:
+    """lfilter (b, a) coefficients for an EMA of the given period."""
+    multiplier, decay = _ema_coeffs(period)
+    return (multiplier,), (1.0, -decay)
+
+
+@lru_cache(maxsize=1)
+def _lfilter():
+    """scipy.signal.lfilter, imported on first use."""
+    from scipy.signal import lfilter
+    return lfilter
+
+
+def _window_maxima(arr, window: int) -> List[int]:
+    """Indices strictly greater than every neighbour within `window` (edges excluded).
+
+    Branch-free: one vectorized comparison of all centres against each of the
+    2*window shifted neighbour slices.
+    """
+    n = len(arr)
+    if n <= 2 * window:
+        return []
+    centre = arr[window:n - window]
+    is_max = np.ones(len(centre), dtype=bool)
+    for j in range(1, window + 1):
+        is_max &= centre > arr[window - j:n - window - j]
+        is_max &= centre > arr[window + j:n - window + j]
+    return (np.flatnonzero(is_max) + window).tolist()
+
+
+def _ema_rows(data, period: int):
+    """_ema applied along each row of a 2-D array (rows are left-aligned series).
+
+    Steps through the columns, each step one vector operation across all rows,
+    with the same arithmetic as the list path of _ema; large arrays
+    (LFILTER_MIN_BARS values or more) go through lfilter when SciPy is installed.
+    """
+    multiplier, decay = _ema_coeffs(period)
+    seeds = data[:, 0].copy()
+    for j in range(1, period):
+        seeds += data[:, j]
+    seeds /= period
+    if HAS_SCIPY and data.size >= LFILTER_MIN_BARS:
+        b, a = _ema_filter(period)
+        tail, _ = _lfilter()(b, a, data[:, period:], axis=1, zi=(decay * seeds)[:, None])
+        return np.hstack((seeds[:, None], tail))
+    
+    out = np.empty((len(data), data.shape[1] - period + 1))
+    out[:, 0] = seeds
+    for j in range(period, data.shape[1]):
+        out[:, j - period + 1] = data[:, j] * multiplier + out[:, j - period] * decay
+    return out
+
+
+def _ema(data, period: int):
+    """EMA seeded with the SMA of the first `period` values (one value per bar from there on).
+
+    Returns a NumPy array when Numba or SciPy is used (long series), otherwise a list.
+    """
+    if HAS_NUMBA and len(data) >= NUMBA_MIN_BARS:
+        return _jit(_ema_loop)(np.asarray(data, dtype=np.float64), period)
+    
+    multiplier, decay = _ema_coeffs(period)
+    if HAS_SCIPY and len(data) >= LFILTER_MIN_BARS:
+        # y[n] = m*x[n] + (1-m)*y[n-1] is a first-order IIR filter
+        data = np.asarray(data, dtype=np.float64)
+        seed = data[:period].sum() / period
+        b, a = _ema_filter(period)
+        tail, _ = _lfilter()(b, a, data[period:], zi=[decay * seed])
+        return np.concatenate(([seed], tail))
+    
+    return list(accumulate(data[period:], lambda ema, x: (x * multiplier) + (ema * decay),
+                           initial=sum(data[:period]) / period))
+
+
 class TechnicalIndicators:
     """Calculate technical indicators from price data."""
     
@@ -94,6 +342,23 @@ class TechnicalIndicators:
         if len(prices) < period + 1:
             return []
         
+        if HAS_NUMBA and len(prices) >= NUMBA_MIN_BARS:
+            return _jit(_rsi_loop)(np.asarray(prices, dtype=np.float64), period).tolist()
+        
+        if HAS_NUMPY:
+            # Rolling window sums as differences of cumulative sums: O(N) in C
+            deltas = np.diff(np.asarray(prices, dtype=np.float64))
+            gains = np.cumsum(np.maximum(deltas, 0.0))
+            losses = np.cumsum(np.maximum(-deltas, 0.0))
+            down_bars = np.cumsum(deltas < 0)
+            avg_gain = (gains[period-1:] - np.concatenate(([0.0], gains[:-period]))) / period
+            avg_loss = (losses[period-1:] - np.concatenate(([0.0], losses[:-period]))) / period
+            no_loss = (down_bars[period-1:] - np.concatenate(([0], down_bars[:-period]))) == 0
+            with np.errstate(divide='ignore', invalid='ignore'):
+                rsi = 100 - 100 / (1 + avg_gain / avg_loss)
+            rsi[no_loss] = 100.0
+            return rsi.tolist()
+        
         deltas = [prices[i] - prices[i-1] for i in range(1, len(prices))]
         gains = [max(d, 0) for d in deltas]
         losses = [abs(min(d, 0)) for d in deltas]
@@ -120,22 +385,20 @@ class TechnicalIndicators:
         if len(prices) < slow + signal:
             return [], []
         
-        def ema(data, period):
-            ema_values = []
-            multiplier = 2 / (period + 1)
-            ema_values.append(sum(data[:period]) / period)
-            for i in range(period, len(data)):
-                ema_values.append((data[i] * multiplier) + (ema_values[-1] * (1 - multiplier)))
-            return ema_values
-        
-        ema_fast = ema(prices, fast)
-        ema_slow = ema(prices, slow)
+        ema_fast = _ema(prices, fast)
+        ema_slow = _ema(prices, slow)
         
         # Align EMAs
         offset = slow - fast
+        if not isinstance(ema_fast, list):
+            macd_line = ema_fast[offset:] - ema_slow
+            signal_line = _ema(macd_line, signal)
+            histogram = macd_line[len(macd_line) - len(signal_line):] - signal_line
+            return macd_line.tolist(), histogram.tolist()
+        
         macd_line = [ema_fast[i + offset] - ema_slow[i] for i in range(len(ema_slow))]
         
-        signal_line = ema(macd_line, signal) if len(macd_line) >= signal else []
+        signal_line = _ema(macd_line, signal) if len(macd_line) >= signal else []
         
         histogram = []
         offset = len(macd_line) - len(signal_line)
@@ -150,16 +413,211 @@ class TechnicalIndicators:
         if len(prices) != len(volumes) or len(prices) < 2:
             return []
         
-        obv = [0]
-        for i in range(1, len(prices)):
-            if prices[i] > prices[i-1]:
-                obv.append(obv[-1] + volumes[i])
-            elif prices[i] < prices[i-1]:
-                obv.append(obv[-1] - volumes[i])
-            else:
-                obv.append(obv[-1])
+        if HAS_NUMBA and len(prices) >= NUMBA_MIN_BARS:
+            return _jit(_obv_loop)(np.asarray(prices, dtype=np.float64), np.asarray(volumes)).tolist()
+        
+        if HAS_NUMPY:
+            # Signed volume (+1 up bar, -1 down bar, 0 flat) accumulated in one pass
+            signs = np.sign(np.diff(np.asarray(prices, dtype=np.float64))).astype(np.int64)
+            obv = np.cumsum(signs * np.asarray(volumes)[1:])
+            return [0] + obv.tolist()
         
-        return obv
+        signed = (v if cur > prev else -v if cur < prev else 0
+                  for prev, cur, v in zip(prices, prices[1:], volumes[1:]))
+        return list(accumulate(signed, initial=0))
+    
+    @staticmethod
+    def calculate_batch(closes_list: List, volumes_list: List, period: int = 14,
+                        fast: int = 12, slow: int = 26, signal: int = 9) -> List[Tuple[List[float], List[float], List[float]]]:
+        """RSI, MACD histogram and OBV for many tickers at once.
+
+        Series are stacked left-aligned into one 2-D array (NaN-padded at the
+        end) so each indicator is a handful of whole-array operations instead
+        of one set per ticker; padding only affects columns past a row's own
+        length, which are sliced off. Needs NumPy, and falls back to per-ticker
+        calculation without it, for a single series, or when no series is long
+        enough for every indicator.
+        Returns one (rsi, histogram, obv) tuple per ticker, as the single-series
+        methods would.
+        """
+        if not closes_list:
+            return []
+        if (not HAS_NUMPY or len(closes_list) < 2
+                or max(map(len, closes_list)) < max(period + 1, slow + signal)):
+            return [(TechnicalIndicators.calculate_rsi(c, period),
+                     TechnicalIndicators.calculate_macd(c, fast, slow, signal)[1],
+                     TechnicalIndicators.calculate_obv(c, v)) for c, v in zip(closes_list, volumes_list)]
+        
+        lengths = [len(c) for c in closes_list]
+        width = max(lengths)
+        closes = np.full((len(lengths), width), np.nan)
+        volumes = np.zeros((len(lengths), width), dtype=np.result_type(*[np.asarray(v).dtype for v in volumes_list]))
+        for i, (c, v) in enumerate(zip(closes_list, volumes_list)):
+            closes[i, :len(c)] = c
+            volumes[i, :len(v)] = v
+        deltas = np.diff(closes, axis=1)
+        
+        # RSI: rolling window sums as differences of row-wise cumulative sums
+        gains = np.cumsum(np.maximum(deltas, 0.0), axis=1)
+        losses = np.cumsum(np.maximum(-deltas, 0.0), axis=1)
+        down_bars = np.cumsum(deltas < 0, axis=1)
+        pad = np.zeros((len(lengths), 1))
+        avg_gain = (gains[:, period-1:] - np.hstack((pad, gains[:, :-period]))) / period
+        avg_loss = (losses[:, period-1:] - np.hstack((pad, losses[:, :-period]))) / period
+        no_loss = (down_bars[:, period-1:] - np.hstack((pad, down_bars[:, :-period]))) == 0
+        with np.errstate(divide='ignore', invalid='ignore'):
+            rsi = 100 - 100 / (1 + avg_gain / avg_loss)
+        rsi[no_loss] = 100.0
+        
+        # MACD histogram: row-wise EMAs (lfilter for very large batches)
+        ema_fast = _ema_rows(closes, fast)
+        ema_slow = _ema_rows(closes, slow)
+        macd_line = ema_fast[:, slow - fast:] - ema_slow
+        histogram = macd_line[:, signal - 1:] - _ema_rows(macd_line, signal)
+        
+        # OBV: signed volume accumulated along each row (padding has sign 0)
+        signs = np.sign(np.nan_to_num(deltas)).astype(np.int64)
+        obv = np.cumsum(signs * volumes[:, 1:], axis=1)
+        
+        results = []
+        for i, (n, v) in enumerate(zip(lengths, volumes_list)):
+            results.append((
+                rsi[i, :n - period].tolist() if n >= period + 1 else [],
+                histogram[i, :n - slow - signal + 2].tolist() if n >= slow + signal else [],
+                [0] + obv[i, :n - 1].tolist() if n >= 2 and len(v) == n else []
+            ))
+        return results
+
+
+@dataclass
+class RSIState:
+    """Streaming RSI over the last `period` price changes (same values as calculate_rsi)."""
+    period: int = 14
+    prev_close: Optional[float] = None
+    deltas: deque = field(default_factory=deque)
+    gain_sum: float = 0.0
+    loss_sum: float = 0.0
+    down_bars: int = 0
+    
+    def update(self, close: float) -> Optional[float]:
+        """Add a close; returns the new RSI once a full window has been seen."""
+        prev, self.prev_close = self.prev_close, close
+        if prev is None:
+            return None
+        
+        delta = close - prev
+        if delta > 0:
+            self.gain_sum += delta
+        elif delta < 0:
+            self.loss_sum -= delta
+            self.down_bars += 1
+        self.deltas.append(delta)
+        
+        if len(self.deltas) > self.period:
+            old = self.deltas.popleft()
+            if old > 0:
+                self.gain_sum -= old
+            elif old < 0:
+                self.loss_sum += old
+                self.down_bars -= 1
+        
+        if len(self.deltas) < self.period:
+            return None
+        if self.down_bars == 0:
+            return 100.0
+        return 100 - 100 / (1 + self.gain_sum / self.loss_sum)
+
+
+@dataclass
+class EMAState:
+    """Streaming EMA seeded with the SMA of the first `period` values."""
+    period: int
+    value: Optional[float] = None
+    seed: List[float] = field(default_factory=list)
+    
+    def update(self, x: float) -> Optional[float]:
+        """Add a value; returns the new EMA once the seed window is full."""
+        if self.value is None:
+            self.seed.append(x)
+            if len(self.seed) == self.period:
+                self.value = sum(self.seed) / self.period
+            return self.value
+        multiplier, decay = _ema_coeffs(self.period)
+        self.value = x * multiplier + self.value * decay
+        return self.value
+
+
+@dataclass
+class MACDState:
+    """Streaming MACD line and histogram (same values as calculate_macd)."""
+    fast: EMAState = field(default_factory=lambda: EMAState(12))
+    slow: EMAState = field(default_factory=lambda: EMAState(26))
+    signal: EMAState = field(default_factory=lambda: EMAState(9))
+    
+    def update(self, close: float) -> Tuple[Optional[float], Optional[float]]:
+        """Add a close; returns (macd, histogram), each None until warmed up."""
+        fast = self.fast.update(close)
+        slow = self.slow.update(close)
+        if slow is None:
+            return None, None
+        macd = fast - slow
+        signal = self.signal.update(macd)
+        return macd, (macd - signal if signal is not None else None)
+
+
+@dataclass
+class OBVState:
+    """Running On-Balance Volume total."""
+    value: float = 0
+    prev_close: Optional[float] = None
+    
+    def update(self, close: float, volume: int) -> float:
+        """Add a bar; returns the new OBV."""
+        if self.prev_close is not None:
+            if close > self.prev_close:
+                self.value += volume
+            elif close < self.prev_close:
+                self.value -= volume
+        self.prev_close = close
+        return self.value
+
+
+@dataclass
+class IndicatorStream:
+    """Per-ticker indicator states plus the series they have produced so far."""
+    bars: int = 0
+    last_date: Optional[str] = None
+    rsi_state: RSIState = field(default_factory=RSIState)
+    macd_state: MACDState = field(default_factory=MACDState)
+    obv_state: OBVState = field(default_factory=OBVState)
+    closes: List[float] = field(default_factory=list)
+    rsi: List[float] = field(default_factory=list)
+    histogram: List[float] = field(default_factory=list)
+    obv: List[float] = field(default_factory=list)
+    
+    def update(self, bar: PriceData):
+        """Advance every indicator by one bar in O(1)."""
+        self.bars += 1
+        self.last_date = bar.date
+        self.closes.append(bar.close)
+        rsi = self.rsi_state.update(bar.close)
+        if rsi is not None:
+            self.rsi.append(rsi)
+        _, hist = self.macd_state.update(bar.close)
+        if hist is not None:
+            self.histogram.append(hist)
+        self.obv.append(self.obv_state.update(bar.close, bar.volume))
+    
+    def series(self) -> Tuple[List[float], List[float], List[float]]:
+        """(rsi, histogram, obv) as the batch methods return them for the same closes.
+
+        calculate_macd and calculate_obv return nothing below slow + signal and
+        2 bars respectively, while the states already produce a first value.
+        """
+        macd = self.macd_state
+        histogram = self.histogram if self.bars >= macd.slow.period + macd.signal.period else []
+        obv = self.obv if self.bars >= 2 else []
+        return self.rsi, histogram, obv
 
 
 class DivergenceDetector:
@@ -172,6 +630,11 @@ class DivergenceDetector:
     
     def find_local_extrema(self, values: List[float], window: int = 3) -> Tuple[List[int], List[int]]:
         """Find local highs and lows indices."""
+        if HAS_NUMPY:
+            arr = np.asarray(values, dtype=np.float64)
+            find = _block_maxima if window >= 5 else _window_maxima
+            return find(arr, window), find(-arr, window)
+        
         highs = []
         lows = []
         
@@ -192,12 +655,19 @@ class DivergenceDetector:
         self,
         prices: List[float],
         indicator_values: List[float],
-        indicator_type: IndicatorType
+        indicator_type: IndicatorType,
+        now: Optional[datetime] = None,
+        ticker: str = ""
     ) -> Optional[DivergenceSignal]:
-        """Detect divergence between price and indicator."""
+        """Detect divergence between price and indicator (stamped `now`, default the current time)."""
         if len(prices) != len(indicator_values) or len(prices) < self.lookback_max:
             return None
         
+        # A flat indicator (e.g. OBV over unchanged closes) has no strict highs or
+        # lows, so it can never diverge - skip both extrema searches
+        if min(indicator_values) == max(indicator_values):
+            return None
+        
         price_highs, price_lows = self.find_local_extrema(prices)
         ind_highs, ind_lows = self.find_local_extrema(indicator_values)
         
@@ -215,10 +685,10 @@ class DivergenceDetector:
                         indicator_type
                     )
                     return DivergenceSignal(
-                        ticker="",  # Set by caller
+                        ticker=ticker,
                         divergence_type=DivergenceType.BEARISH,
                         indicator=indicator_type,
-                        detected_at=datetime.now(),
+                        detected_at=now or datetime.now(),
                         price_start=prices[p1_idx],
                         price_end=prices[p2_idx],
                         indicator_start=indicator_values[i1_idx],
@@ -242,10 +712,10 @@ class DivergenceDetector:
                         indicator_type
                     )
                     return DivergenceSignal(
-                        ticker="",
+                        ticker=ticker,
                         divergence_type=DivergenceType.BULLISH,
                         indicator=indicator_type,
-                        detected_at=datetime.now(),
+                        detected_at=now or datetime.now(),
                         price_start=prices[p1_idx],
                         price_end=prices[p2_idx],
                         indicator_start=indicator_values[i1_idx],
@@ -258,6 +728,56 @@ class DivergenceDetector:
         
         return None
     
+    def compute_indicators(self, closes, volumes) -> Tuple[List[float], List[float], List[float]]:
+        """RSI, MACD histogram and OBV series for a price history."""
+        rsi = self.indicators.calculate_rsi(closes)
+        macd_line, histogram = self.indicators.calculate_macd(closes)
+        obv = self.indicators.calculate_obv(closes, volumes)
+        return rsi, histogram, obv
+    
+    def find_signals(self, ticker: str, closes, rsi: List[float], histogram: List[float],
+                     obv: List[float], now: Optional[datetime] = None) -> List[DivergenceSignal]:
+        """Check each indicator series for divergence against closes."""
+        signals = []
+        now = now or datetime.now()
+        
+        # Check RSI divergence
+        if len(rsi) > 0:
+            # Align RSI with prices
+            offset = len(closes) - len(rsi)
+            aligned_prices = closes[offset:]
+            
+            signal = self.detect_divergence(aligned_prices, rsi, IndicatorType.RSI, now, ticker)
+            if signal:
+                signals.append(signal)
+        
+        # Check MACD divergence
+        if len(histogram) > 0:
+            offset = len(closes) - len(histogram)
+            aligned_prices = closes[offset:]
+            
+            signal = self.detect_divergence(aligned_prices, histogram, IndicatorType.MACD, now, ticker)
+            if signal:
+                signals.append(signal)
+        
+        # Check OBV divergence
+        if len(obv) == len(closes):
+            signal = self.detect_divergence(closes, obv, IndicatorType.OBV, now, ticker)
+            if signal:
+                signals.append(signal)
+        
+        return signals
+    
+    def scan_series(self, ticker: str, closes, volumes,
+                    now: Optional[datetime] = None) -> Tuple[List[DivergenceSignal], tuple]:
+        """Compute indicators and find signals for one ticker.
+
+        Pure (touches no scanner state), so it can run in a worker process.
+        Returns (signals, indicator series).
+        """
+        series = self.compute_indicators(closes, volumes)
+        return self.find_signals(ticker, closes, *series, now=now), series
+    
     def _calculate_strength(self, price_diff: float, ind_diff: float, indicator: IndicatorType) -> Strength:
         """Calculate divergence strength based on magnitude."""
         # Normalize by indicator type
@@ -299,7 +819,12 @@ class DivergenceScanner:
         self.signals: List[DivergenceSignal] = []
         self.outcomes: List[DivergenceOutcome] = []
         self.watchlist: List[str] = []
-        self.price_data: Dict[str, List[PriceData]] = {}
+        # OHLCVFrame per ticker; a list of PriceData assigned here is converted on first use
+        self.price_data: Dict[str, Union[OHLCVFrame, List[PriceData]]] = {}
+        self._streams: Dict[str, IndicatorStream] = {}
+        self._indicator_cache: Dict[str, Tuple[tuple, tuple]] = {}
+        self._timeline_key: Optional[tuple] = None
+        self._timeline: Tuple[List[datetime], List[DivergenceSignal]] = ([], [])
     
     def add_to_watchlist(self, ticker: str):
         """Add ticker to watchlist."""
@@ -311,127 +836,220 @@ class DivergenceScanner:
         if ticker in self.watchlist:
             self.watchlist.remove(ticker)
     
-    def scan_ticker(self, ticker: str, prices: List[PriceData]) -> List[DivergenceSignal]:
+    def _frame(self, ticker: str) -> OHLCVFrame:
+        """price_data[ticker] as an OHLCVFrame, converting (and storing) a PriceData list."""
+        prices = self.price_data.setdefault(ticker, OHLCVFrame())
+        if not isinstance(prices, OHLCVFrame):
+            prices = self.price_data[ticker] = OHLCVFrame.from_bars(prices)
+        return prices
+    
+    def add_bars(self, ticker: str, bars: Iterable[PriceData]):
+        """Append price bars to a ticker's history."""
+        self._frame(ticker).extend(bars)
+    
+    def scan_ticker(self, ticker: str, prices: Union[OHLCVFrame, List[PriceData]],
+                    now: Optional[datetime] = None) -> List[DivergenceSignal]:
         """Scan a single ticker for divergences."""
-        signals = []
+        frame = prices if isinstance(prices, OHLCVFrame) else OHLCVFrame.from_bars(prices)
         
-        closes = [p.close for p in prices]
-        volumes = [p.volume for p in prices]
+        # Indicators are reused while the price history is unchanged
+        series = self._cached_series(ticker, prices, frame)
+        if series is not None:
+            signals = self.detector.find_signals(ticker, frame.closes, *series, now=now)
+        else:
+            signals, series = self.detector.scan_series(ticker, frame.closes, frame.volumes, now)
+            self._cache_series(ticker, prices, frame, series)
         
-        # Check RSI divergence
-        rsi = self.detector.indicators.calculate_rsi(closes)
-        if len(rsi) > 0:
-            # Align RSI with prices
-            offset = len(closes) - len(rsi)
-            aligned_prices = closes[offset:]
-            
-            signal = self.detector.detect_divergence(aligned_prices, rsi, IndicatorType.RSI)
-            if signal:
-                signal.ticker = ticker
-                signals.append(signal)
-        
-        # Check MACD divergence
-        macd_line, histogram = self.detector.indicators.calculate_macd(closes)
-        if len(histogram) > 0:
-            offset = len(closes) - len(histogram)
-            aligned_prices = closes[offset:]
-            
-            signal = self.detector.detect_divergence(aligned_prices, histogram, IndicatorType.MACD)
-            if signal:
-                signal.ticker = ticker
-                signals.append(signal)
+        self.signals.extend(signals)
+        return signals
+    
+    @staticmethod
+    def _fingerprint(prices, frame: OHLCVFrame) -> Optional[tuple]:
+        """Cheap identity of a price history, for the indicator cache."""
+        return (id(prices), len(frame), frame.dates[-1], frame.closes[-1]) if len(frame) else None
+    
+    def _cached_series(self, ticker: str, prices, frame: OHLCVFrame) -> Optional[tuple]:
+        """Cached indicator series for this exact price history, if any."""
+        cached = self._indicator_cache.get(ticker)
+        if cached and cached[0] == self._fingerprint(prices, frame):
+            return cached[1]
+        return None
+    
+    def _cache_series(self, ticker: str, prices, frame: OHLCVFrame, series: tuple):
+        self._indicator_cache[ticker] = (self._fingerprint(prices, frame), series)
+    
+    def update_ticker(self, ticker: str, new_bars: List[PriceData]) -> List[DivergenceSignal]:
+        """Append new bars to a ticker and scan it, updating indicators incrementally.
+
+        Indicator state is kept per ticker, so each new bar costs O(1) instead
+        of recomputing every indicator over the whole history. The state is
+        rebuilt from price_data if the stored history was replaced meanwhile.
+        """
+        frame = self._frame(ticker)
+        stream = self._streams.get(ticker)
+        if stream is None or stream.bars != len(frame) or (len(frame) and frame.dates[-1] != stream.last_date):
+            stream = IndicatorStream()
+            for bar in frame.bars():
+                stream.update(bar)
+            self._streams[ticker] = stream
         
-        # Check OBV divergence
-        obv = self.detector.indicators.calculate_obv(closes, volumes)
-        if len(obv) == len(closes):
-            signal = self.detector.detect_divergence(closes, obv, IndicatorType.OBV)
-            if signal:
-                signal.ticker = ticker
-                signals.append(signal)
+        for bar in new_bars:
+            if stream.last_date is not None and bar.date <= stream.last_date:
+                continue  # already processed
+            frame.append(bar)
+            stream.update(bar)
         
+        signals = self.detector.find_signals(ticker, stream.closes, *stream.series())
         self.signals.extend(signals)
         return signals
     
-    def scan_watchlist(self) -> Dict[str, List[DivergenceSignal]]:
-        """Scan all watchlist tickers for divergences."""
+    def scan_watchlist(self, max_workers: int = 1) -> Dict[str, List[DivergenceSignal]]:
+        """Scan all watchlist tickers for divergences.
+
+        With max_workers > 1, tickers whose indicators are not cached are
+        scanned in a process pool (only the close/volume columns are sent to
+        the workers). Worth it for large watchlists; process start-up costs
+        more than scanning a handful of tickers serially.
+        """
+        tickers = [t for t in self.watchlist if t in self.price_data]
+        now = datetime.now()  # one timestamp for the whole scan
+        
+        frames = {t: self._frame(t) for t in tickers}
+        pending = [t for t in tickers if self._cached_series(t, frames[t], frames[t]) is None]
+        
+        scanned = {}
+        if max_workers > 1 and len(pending) > 1:
+            with ProcessPoolExecutor(max_workers=max_workers) as pool:
+                scanned = dict(zip(pending, pool.map(self.detector.scan_series, pending,
+                                                     [frames[t].closes for t in pending],
+                                                     [frames[t].volumes for t in pending],
+                                                     [now] * len(pending))))
+        elif len(pending) > 1:
+            # Compute every uncached ticker's indicators in one 2-D batch
+            batch = self.detector.indicators.calculate_batch([frames[t].closes for t in pending],
+                                                             [frames[t].volumes for t in pending])
+            for ticker, series in zip(pending, batch):
+                self._cache_series(ticker, frames[ticker], frames[ticker], series)
+        
         results = {}
-        for ticker in self.watchlist:
-            if ticker in self.price_data:
-                signals = self.scan_ticker(ticker, self.price_data[ticker])
-                if signals:
-                    results[ticker] = signals
+        for ticker in tickers:
+            if ticker in scanned:
+                frame = frames[ticker]
+                signals, series = scanned[ticker]
+                self._cache_series(ticker, frame, frame, series)
+                self.signals.extend(signals)
+            else:
+                signals = self.scan_ticker(ticker, frames[ticker], now)
+            if signals:
+                results[ticker] = signals
         return results
     
     def get_recent_signals(self, hours: int = 24, divergence_type: Optional[DivergenceType] = None) -> List[DivergenceSignal]:
-        """Get signals from the last N hours."""
+        """Get signals from the last N hours (newest first)."""
         cutoff = datetime.now() - timedelta(hours=hours)
-        signals = [s for s in self.signals if s.detected_at >= cutoff]
+        times, ordered = self._signal_timeline()
+        signals = ordered[bisect_left(times, cutoff):]
+        signals.reverse()
         
         if divergence_type:
             signals = [s for s in signals if s.divergence_type == divergence_type]
         
-        return sorted(signals, key=lambda s: s.detected_at, reverse=True)
+        return signals
+    
+    def _signal_timeline(self) -> Tuple[List[datetime], List[DivergenceSignal]]:
+        """Signals sorted oldest first, with their detection times for bisecting.
+
+        Rebuilt only when self.signals has changed. Equal timestamps are ordered
+        so that reversing gives the same order as a stable newest-first sort.
+        """
+        key = (id(self.signals), len(self.signals))
+        if self._timeline_key != key:
+            signals = self.signals
+            order = sorted(range(len(signals)), key=lambda i: (signals[i].detected_at, -i))
+            ordered = [signals[i] for i in order]
+            self._timeline = ([s.detected_at for s in ordered], ordered)
+            self._timeline_key = key
+        return self._timeline
     
     def get_accuracy_stats(self, indicator: Optional[IndicatorType] = None) -> Dict:
-        """Calculate historical accuracy statistics."""
-        outcomes = self.outcomes
-        if indicator:
-            outcomes = [o for o in outcomes if o.signal.indicator == indicator]
-        
-        if not outcomes:
-            return {"message": "No tracked outcomes yet"}
+        """Calculate historical accuracy statistics (single pass over outcomes)."""
+        total = successful = 0
+        bullish = bullish_wins = bearish = bearish_wins = 0
+        return_sum = winning_return_sum = 0.0
+        ind_counts = [0] * len(IndicatorType)  # indexed by _INDICATOR_CODE
+        ind_wins = [0] * len(IndicatorType)
         
-        total = len(outcomes)
-        successful = sum(1 for o in outcomes if o.success)
+        for o in self.outcomes:
+            signal = o.signal
+            if indicator and signal.indicator is not indicator:
+                continue
+            code = _INDICATOR_CODE[signal.indicator]
+            is_bullish = signal.is_bullish
+            total += 1
+            return_sum += o.return_pct
+            ind_counts[code] += 1
+            if is_bullish:
+                bullish += 1
+            else:
+                bearish += 1
+            if o.success:
+                successful += 1
+                winning_return_sum += o.return_pct
+                ind_wins[code] += 1
+                if is_bullish:
+                    bullish_wins += 1
+                else:
+                    bearish_wins += 1
         
-        bullish = [o for o in outcomes if o.signal.is_bullish]
-        bearish = [o for o in outcomes if not o.signal.is_bullish]
+        if not total:
+            return {"message": "No tracked outcomes yet"}
         
         return {
             "total_signals": total,
             "successful": successful,
             "accuracy": successful / total * 100,
-            "bullish_accuracy": sum(1 for o in bullish if o.success) / len(bullish) * 100 if bullish else 0,
-            "bearish_accuracy": sum(1 for o in bearish if o.success) / len(bearish) * 100 if bearish else 0,
-            "avg_return": sum(o.return_pct for o in outcomes) / total,
-            "avg_winning_return": sum(o.return_pct for o in outcomes if o.success) / successful if successful else 0,
-            "by_indicator": self._accuracy_by_indicator(outcomes)
+            "bullish_accuracy": bullish_wins / bullish * 100 if bullish else 0,
+            "bearish_accuracy": bearish_wins / bearish * 100 if bearish else 0,
+            "avg_return": return_sum / total,
+            "avg_winning_return": winning_return_sum / successful if successful else 0,
+            "by_indicator": {
+                ind.value: {"count": ind_counts[code], "accuracy": ind_wins[code] / ind_counts[code] * 100}
+                for code, ind in enumerate(IndicatorType) if ind_counts[code]
+            }
         }
     
-    def _accuracy_by_indicator(self, outcomes: List[DivergenceOutcome]) -> Dict:
-        """Break down accuracy by indicator."""
-        by_ind = {}
-        for indicator in IndicatorType:
-            ind_outcomes = [o for o in outcomes if o.signal.indicator == indicator]
-            if ind_outcomes:
-                successful = sum(1 for o in ind_outcomes if o.success)
-                by_ind[indicator.value] = {
-                    "count": len(ind_outcomes),
-                    "accuracy": successful / len(ind_outcomes) * 100
-                }
-        return by_ind
-    
     def get_signal_summary(self) -> Dict:
-        """Get summary of current signals."""
+        """Get summary of current signals (single pass over the last 48h)."""
         recent = self.get_recent_signals(hours=48)
         
-        bullish = [s for s in recent if s.is_bullish]
-        bearish = [s for s in recent if not s.is_bullish]
-        
-        by_indicator = {}
-        for ind in IndicatorType:
-            count = len([s for s in recent if s.indicator == ind])
-            if count > 0:
-                by_indicator[ind.value] = count
+        bullish = strong = high_confidence = 0
+        counts = [0] * len(IndicatorType)  # indexed by _INDICATOR_CODE
+        tickers = set()
+        for s in recent:
+            tickers.add(s.ticker)
+            counts[_INDICATOR_CODE[s.indicator]] += 1
+            if s.is_bullish:
+                bullish += 1
+            if s.strength is Strength.STRONG:
+                strong += 1
+            if s.confidence >= 0.75:
+                high_confidence += 1
         
         return {
             "total_signals": len(recent),
-            "bullish": len(bullish),
-            "bearish": len(bearish),
-            "by_indicator": by_indicator,
-            "strong_signals": len([s for s in recent if s.strength == Strength.STRONG]),
-            "high_confidence": len([s for s in recent if s.confidence >= 0.75]),
-            "tickers_with_signals": list(set(s.ticker for s in recent))
+            "bullish": bullish,
+            "bearish": len(recent) - bullish,
+            "by_indicator": {ind.value: counts[code] for code, ind in enumerate(IndicatorType) if counts[code]},
+            "strong_signals": strong,
+            "high_confidence": high_confidence,
+            "tickers_with_signals": list(tickers)
+        }
+    
+    def compute_all_stats(self) -> Dict:
+        """Signal summary and accuracy stats together, for reports that need both."""
+        return {
+            "summary": self.get_signal_summary(),
+            "accuracy": self.get_accuracy_stats()
         }
 
 
@@ -441,14 +1059,16 @@ def generate_sample_data() -> DivergenceScanner:
     
     tickers = ['AAPL', 'TSLA', 'NVDA', 'AMD', 'META', 'GOOGL', 'MSFT', 'AMZN', 'SPY', 'QQQ']
     
+    now = datetime.now()
+    dates = [(now - timedelta(days=60-i)).strftime("%Y-%m-%d") for i in range(60)]
+    
     for ticker in tickers:
         scanner.add_to_watchlist(ticker)
         
         # Generate price data
         prices = []
         base_price = random.uniform(100, 500)
-        for i in range(60):
-            date = (datetime.now() - timedelta(days=60-i)).strftime("%Y-%m-%d")
+        for date in dates:
             change = random.gauss(0, 0.02)
             base_price *= (1 + change)
             
@@ -461,7 +1081,7 @@ def generate_sample_data() -> DivergenceScanner:
                 volume=random.randint(1_000_000, 50_000_000)
             ))
         
-        scanner.price_data[ticker] = prices
+        scanner.add_bars(ticker, prices)
     
     # Scan for divergences
     scanner.scan_watchlist()
@@ -472,7 +1092,7 @@ def generate_sample_data() -> DivergenceScanner:
             ticker="NVDA",
             divergence_type=DivergenceType.BULLISH,
             indicator=IndicatorType.RSI,
-            detected_at=datetime.now() - timedelta(hours=2),
+            detected_at=now - timedelta(hours=2),
             price_start=485.50,
             price_end=478.20,
             indicator_start=28.5,
@@ -486,7 +1106,7 @@ def generate_sample_data() -> DivergenceScanner:
             ticker="TSLA",
             divergence_type=DivergenceType.BEARISH,
             indicator=IndicatorType.MACD,
-            detected_at=datetime.now() - timedelta(hours=5),
+            detected_at=now - timedelta(hours=5),
             price_start=242.10,
             price_end=248.90,
             indicator_start=2.45,
@@ -500,7 +1120,7 @@ def generate_sample_data() -> DivergenceScanner:
             ticker="AMD",
             divergence_type=DivergenceType.BULLISH,
             indicator=IndicatorType.OBV,
-            detected_at=datetime.now() - timedelta(hours=8),
+            detected_at=now - timedelta(hours=8),
             price_start=125.80,
             price_end=122.40,
             indicator_start=15_000_000,
@@ -514,7 +1134,7 @@ def generate_sample_data() -> DivergenceScanner:
             ticker="META",
             divergence_type=DivergenceType.HIDDEN_BEARISH,
             indicator=IndicatorType.RSI,
-            detected_at=datetime.now() - timedelta(hours=12),
+            detected_at=now - timedelta(hours=12),
             price_start=392.50,
             price_end=385.20,
             indicator_start=58.2,
@@ -533,7 +1153,7 @@ def generate_sample_data() -> DivergenceScanner:
         outcome = DivergenceOutcome(
             signal=signal,
             outcome_price=signal.price_end * (1.05 if signal.is_bullish else 0.95),
-            outcome_date=datetime.now(),
+            outcome_date=now,
             return_pct=5.0 if signal.is_bullish else -5.0,
             success=True
         )
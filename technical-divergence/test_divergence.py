@@ -0,0 +1,187 @@
+"""Tests for divergence.py (run with pytest from this directory)."""
+
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+import divergence
+from divergence import DivergenceDetector, DivergenceScanner, IndicatorStream, OHLCVFrame, PriceData, TechnicalIndicators
+
+
+def make_bars(seed: int, n: int = 120):
+    """Deterministic random-walk daily bars."""
+    rng = random.Random(seed)
+    start = datetime(2024, 1, 1)
+    price = 100.0
+    bars = []
+    for i in range(n):
+        price *= 1 + rng.gauss(0, 0.02)
+        bars.append(PriceData((start + timedelta(days=i)).strftime("%Y-%m-%d"),
+                              price, price * 1.01, price * 0.99, price, rng.randint(1_000, 1_000_000)))
+    return bars
+
+
+def signal_keys(signals):
+    return sorted((s.ticker, s.divergence_type, s.indicator, s.confidence) for s in signals)
+
+
+def signal_details(signals):
+    """Every signal field except the detection time, in order."""
+    return [(s.ticker, s.divergence_type, s.indicator, s.price_start, s.price_end, s.indicator_start,
+             s.indicator_end, s.lookback_bars, s.strength, s.confidence) for s in signals]
+
+
+def test_scan_watchlist_accepts_assigned_bar_lists():
+    tickers = ["AAA", "BBB", "CCC"]
+    from_lists = DivergenceScanner()
+    from_frames = DivergenceScanner()
+    for seed, ticker in enumerate(tickers):
+        from_lists.add_to_watchlist(ticker)
+        from_frames.add_to_watchlist(ticker)
+        from_lists.price_data[ticker] = make_bars(seed)
+        from_frames.price_data[ticker] = OHLCVFrame.from_bars(make_bars(seed))
+    
+    results = from_lists.scan_watchlist()
+    from_frames.scan_watchlist()
+    
+    assert signal_keys(from_lists.signals) == signal_keys(from_frames.signals)
+    assert all(isinstance(from_lists.price_data[t], OHLCVFrame) for t in tickers)
+    assert set(results) <= set(tickers)
+    
+    # Rescanning hits the indicator cache for the converted histories
+    from_lists.scan_watchlist()
+
+
+def test_update_ticker_and_add_bars_accept_assigned_bar_list():
+    bars = make_bars(7, 80)
+    scanner = DivergenceScanner()
+    scanner.price_data["AAA"] = bars[:60]
+    scanner.update_ticker("AAA", bars[60:70])
+    scanner.price_data["BBB"] = bars[:60]
+    scanner.add_bars("BBB", bars[60:70])
+    
+    assert len(scanner.price_data["AAA"]) == 70
+    assert len(scanner.price_data["BBB"]) == 70
+    assert scanner.price_data["AAA"].dates[-1] == bars[69].date
+
+
+def batch_series(bars):
+    closes = [b.close for b in bars]
+    return (TechnicalIndicators.calculate_rsi(closes),
+            TechnicalIndicators.calculate_macd(closes)[1],
+            TechnicalIndicators.calculate_obv(closes, [b.volume for b in bars]))
+
+
+@pytest.mark.parametrize("n", [1, 14, 15, 34, 35, 200])
+def test_indicator_stream_matches_batch(n):
+    bars = make_bars(3, n)
+    stream = IndicatorStream()
+    for bar in bars:
+        stream.update(bar)
+    stream_rsi, stream_histogram, stream_obv = stream.series()
+    rsi, histogram, obv = batch_series(bars)
+    
+    assert stream_rsi == pytest.approx(rsi)
+    assert stream_histogram == pytest.approx(histogram)
+    assert stream_obv == obv
+
+
+def test_update_ticker_matches_batch_after_appends():
+    bars = make_bars(11, 150)
+    scanner = DivergenceScanner()
+    scanner.add_bars("AAA", bars[:40])
+    for start in range(40, 150, 10):
+        scanner.update_ticker("AAA", bars[start:start + 10])
+    # Already-seen bars are skipped
+    scanner.update_ticker("AAA", bars[140:])
+    
+    stream = scanner._streams["AAA"]
+    stream_rsi, stream_histogram, stream_obv = stream.series()
+    rsi, histogram, obv = batch_series(bars)
+    assert stream.bars == len(scanner.price_data["AAA"]) == 150
+    assert stream_rsi == pytest.approx(rsi)
+    assert stream_histogram == pytest.approx(histogram)
+    assert stream_obv == obv
+
+
+def strict_extrema(values, window):
+    """The original pure-Python extremum loop, as the reference."""
+    highs, lows = [], []
+    for i in range(window, len(values) - window):
+        if all(values[i] > values[i-j] and values[i] > values[i+j] for j in range(1, window + 1)):
+            highs.append(i)
+        if all(values[i] < values[i-j] and values[i] < values[i+j] for j in range(1, window + 1)):
+            lows.append(i)
+    return highs, lows
+
+
+def extrema_cases():
+    rng = random.Random(5)
+    yield [1.0] * 30  # flat: no strict extrema
+    yield [5.0, 1.0, 2.0, 3.0, 2.0, 1.0, 0.0, 9.0]  # extremes at both edges
+    yield [1.0, 2.0, 3.0, 3.0, 2.0, 1.0, 1.0, 2.0, 3.0, 4.0, 4.0, 3.0, 2.0, 1.0]  # plateau peaks and troughs
+    for n in (0, 1, 2, 3, 5, 6, 7, 8, 10, 11, 12, 13, 17, 18):  # around 2*window+1 for every window tested
+        yield [rng.random() for _ in range(n)]
+    for _ in range(20):
+        # Coarsely rounded walks have many ties and plateaus
+        walk = [0.0]
+        for _ in range(rng.randint(20, 120)):
+            walk.append(walk[-1] + rng.choice((-1.0, 0.0, 0.0, 1.0)))
+        yield walk
+        yield [round(rng.gauss(0, 1), 1) for _ in range(rng.randint(20, 120))]
+
+
+@pytest.mark.parametrize("window", [1, 2, 3, 4, 5, 6, 8])
+def test_find_local_extrema_matches_strict_loop(window):
+    detector = DivergenceDetector()
+    for values in extrema_cases():
+        assert detector.find_local_extrema(values, window) == strict_extrema(values, window), values
+
+
+def test_scan_watchlist_process_pool_matches_serial():
+    def scan(max_workers):
+        scanner = DivergenceScanner()
+        for seed in range(12):
+            ticker = f"T{seed}"
+            scanner.add_to_watchlist(ticker)
+            scanner.add_bars(ticker, make_bars(seed))
+        results = scanner.scan_watchlist(max_workers=max_workers)
+        return scanner, {ticker: signal_details(signals) for ticker, signals in results.items()}
+    
+    serial, serial_results = scan(1)
+    pooled, pooled_results = scan(2)
+    
+    assert serial_results and pooled_results == serial_results
+    assert signal_details(pooled.signals) == signal_details(serial.signals)
+    # Worker results are cached like serial ones
+    assert pooled._indicator_cache.keys() == serial._indicator_cache.keys()
+
+
+@pytest.mark.parametrize("lfilter", [False, True])
+def test_calculate_batch_matches_single_series(monkeypatch, lfilter):
+    if lfilter:
+        if not divergence.HAS_SCIPY:
+            pytest.skip("scipy is not installed")
+        monkeypatch.setattr(divergence, "LFILTER_MIN_BARS", 0)
+    # Lengths on both sides of every warm-up boundary, so rows are padded differently
+    bar_lists = [make_bars(seed, n) for seed, n in enumerate([1, 2, 14, 15, 34, 35, 36, 60, 120, 250])]
+    closes = [OHLCVFrame.from_bars(bars).closes for bars in bar_lists]
+    volumes = [OHLCVFrame.from_bars(bars).volumes for bars in bar_lists]
+    
+    singles = [batch_series(bars) for bars in bar_lists]
+    # The column-stepped EMA repeats the single-series arithmetic exactly; lfilter rounds differently
+    tolerance = {"rel": 1e-12, "abs": 1e-12} if lfilter else {"rel": 0, "abs": 0}
+    
+    # The 2-D path must not fall back to the single-series methods
+    def per_ticker(*args):
+        raise AssertionError("calculate_batch fell back to per-ticker calculation")
+    for name in ("calculate_rsi", "calculate_macd", "calculate_obv"):
+        monkeypatch.setattr(TechnicalIndicators, name, staticmethod(per_ticker))
+    batch = TechnicalIndicators.calculate_batch(closes, volumes)
+    
+    assert len(batch) == len(bar_lists)
+    for (single_rsi, single_histogram, single_obv), (rsi, histogram, obv) in zip(singles, batch):
+        assert rsi == pytest.approx(single_rsi, **tolerance)
+        assert histogram == pytest.approx(single_histogram, **tolerance)
+        assert obv == single_obv
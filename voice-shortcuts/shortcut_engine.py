@@ -4,33 +4,164 @@ Voice Shortcut Engine
 Matches spoken phrases to configured shortcuts and executes workflows.
 """
 
+import atexit
+import heapq
 import json
+import mmap
 import os
+import threading
+from collections import Counter, defaultdict, deque
 from datetime import datetime
 from pathlib import Path
 import re
 from typing import Optional, Dict, List, Any
 
+# orjson is optional - faster C serializer, falls back to the stdlib json module
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+# pyahocorasick is optional - one-pass trigger search, falls back to a linear scan
+try:
+    import ahocorasick
+    HAS_AHOCORASICK = True
+except ImportError:
+    HAS_AHOCORASICK = False
+
+# rapidfuzz is optional - C++ typo-tolerant scoring, falls back to word overlap
+try:
+    from rapidfuzz import fuzz
+    from rapidfuzz.distance import Levenshtein
+    HAS_RAPIDFUZZ = True
+except ImportError:
+    HAS_RAPIDFUZZ = False
+
 # Default shortcuts file
 SHORTCUTS_FILE = Path(__file__).parent / "voice_shortcuts.json"
-USAGE_LOG_FILE = Path(__file__).parent / "shortcut_usage.json"
+USAGE_COUNTS_FILE = Path(__file__).parent / "shortcut_usage_counts.json"
+USAGE_EVENTS_FILE = Path(__file__).parent / "shortcut_events.jsonl"
+# Pre-split log ({"events": [...], "daily_counts": {...}}), migrated on load
+LEGACY_USAGE_LOG_FILE = Path(__file__).parent / "shortcut_usage.json"
+
+# Minimum rapidfuzz ratio (0-100) between a trigger and a run of as many transcript
+# words for a fuzzy trigger match; each word must also be within its typo budget
+FUZZY_SCORE_CUTOFF = 85
+# Share of a trigger's words (in any order) that matches it without rapidfuzz, or
+# when no typo-tolerant match is found
+WORD_OVERLAP_CUTOFF = 0.8
+
+# Seconds without changes before pending writes are flushed to disk
+FLUSH_DELAY = 1.0
+
+# normalize_text patterns: common filler words (whole words only), whitespace runs
+_FILLER_RE = re.compile(r'\b(?:please|can you|could you|hey|um|uh|like)\b')
+_WS_RE = re.compile(r'\s+')
+
+
+def typo_budget(word: str) -> int:
+    """Edits tolerated in a transcript word standing for this trigger word."""
+    if len(word) <= 3:
+        return 0
+    return 1 if len(word) <= 7 else 2
+
+
+def read_json(path: Path) -> Any:
+    """Parse a JSON file (orjson parses straight from a read-only mmap, no bytes copy)."""
+    with open(path, 'rb') as f:
+        if HAS_ORJSON and os.fstat(f.fileno()).st_size:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as view:
+                return orjson.loads(view)
+        data = f.read()
+    return orjson.loads(data) if HAS_ORJSON else json.loads(data)
+
+
+def write_json(path: Path, obj: Any, pretty: bool = False):
+    """Write obj as JSON; compact unless pretty (2-space indent)."""
+    if HAS_ORJSON:
+        option = orjson.OPT_APPEND_NEWLINE | (orjson.OPT_INDENT_2 if pretty else 0)
+        with open(path, 'wb') as f:
+            f.write(orjson.dumps(obj, option=option))
+    else:
+        with open(path, 'w') as f:
+            json.dump(obj, f, indent=2 if pretty else None, separators=None if pretty else (',', ':'))
+            f.write('\n')
+
+
+def json_line(obj: Any) -> bytes:
+    """Serialize obj as one compact JSON Lines record."""
+    if HAS_ORJSON:
+        return orjson.dumps(obj, option=orjson.OPT_APPEND_NEWLINE)
+    return json.dumps(obj, separators=(',', ':')).encode() + b'\n'
 
 
 class ShortcutEngine:
     """Engine for matching and executing voice shortcuts."""
     
-    def __init__(self, shortcuts_file: str = None):
+    def __init__(self, shortcuts_file: str = None, pretty: bool = False):
         self.shortcuts_file = Path(shortcuts_file) if shortcuts_file else SHORTCUTS_FILE
+        self.pretty = pretty  # indent the shortcuts file (the usage log is always compact)
         self.shortcuts: List[Dict] = []
-        self.usage_log: Dict = {}
+        self._by_id: Dict[int, Dict] = {}  # same dicts as self.shortcuts, keyed by id
+        self.usage_log: Dict = {}  # {"daily_counts": {day: {shortcut_id: count}}}
+        self._events_fp = None  # append-only USAGE_EVENTS_FILE, opened on first event
+        # (automaton, word index, normalized triggers, trigger words, trigger word sets,
+        # exact-trigger dict), by position in self.shortcuts; None until the next match
+        self._match_index = None
+        # Deferred writes: changes mark a file dirty and (re)arm a flush timer
+        self._lock = threading.RLock()
+        self._shortcuts_dirty = False
+        self._usage_dirty = False
+        self._flush_timer: Optional[threading.Timer] = None
         self.load_shortcuts()
         self.load_usage_log()
+        atexit.register(self.flush)
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+    
+    def close(self):
+        """Flush pending writes and close the usage event log."""
+        self.flush()
+        with self._lock:
+            if self._events_fp is not None:
+                self._events_fp.close()
+                self._events_fp = None
+    
+    def _mark_dirty(self, shortcuts: bool = False, usage: bool = False):
+        """Record unsaved changes and debounce the flush."""
+        with self._lock:
+            self._shortcuts_dirty |= shortcuts
+            self._usage_dirty |= usage
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+            self._flush_timer = threading.Timer(FLUSH_DELAY, self.flush)
+            self._flush_timer.daemon = True
+            self._flush_timer.start()
+    
+    def flush(self):
+        """Write pending shortcut and usage changes to disk."""
+        with self._lock:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            if self._shortcuts_dirty:
+                self._shortcuts_dirty = False
+                self.save_shortcuts()
+            if self._usage_dirty:
+                self._usage_dirty = False
+                self.save_usage_log()
     
     def load_shortcuts(self):
         """Load shortcuts from JSON file."""
+        self._match_index = None
         if self.shortcuts_file.exists():
-            with open(self.shortcuts_file, 'r') as f:
-                self.shortcuts = json.load(f)
+            self.shortcuts = read_json(self.shortcuts_file)
+            self._by_id = {s['id']: s for s in self.shortcuts}
         else:
             # Default shortcuts
             self.shortcuts = [
@@ -75,68 +206,161 @@ class ShortcutEngine:
                     "created": datetime.now().isoformat()
                 }
             ]
+            self._by_id = {s['id']: s for s in self.shortcuts}
             self.save_shortcuts()
     
     def save_shortcuts(self):
         """Save shortcuts to JSON file."""
-        with open(self.shortcuts_file, 'w') as f:
-            json.dump(self.shortcuts, f, indent=2)
+        write_json(self.shortcuts_file, self.shortcuts, pretty=self.pretty)
     
     def load_usage_log(self):
         """Load usage log for analytics."""
-        if USAGE_LOG_FILE.exists():
-            with open(USAGE_LOG_FILE, 'r') as f:
-                self.usage_log = json.load(f)
+        if USAGE_COUNTS_FILE.exists():
+            self.usage_log = read_json(USAGE_COUNTS_FILE)
+        elif LEGACY_USAGE_LOG_FILE.exists():
+            legacy = read_json(LEGACY_USAGE_LOG_FILE)
+            self.usage_log = {"daily_counts": legacy.get("daily_counts", {})}
+            with open(USAGE_EVENTS_FILE, 'ab') as f:
+                f.writelines(json_line(event) for event in legacy.get("events", []))
+            self.save_usage_log()
+            LEGACY_USAGE_LOG_FILE.unlink()
         else:
-            self.usage_log = {"events": [], "daily_counts": {}}
+            self.usage_log = {"daily_counts": {}}
+        # day -> Counter of shortcut ids, so logging is a single += 1
+        daily_counts = self.usage_log.get("daily_counts", {})
+        self.usage_log["daily_counts"] = defaultdict(
+            Counter, {day: Counter(counts) for day, counts in daily_counts.items()})
     
     def save_usage_log(self):
-        """Save usage log."""
-        with open(USAGE_LOG_FILE, 'w') as f:
-            json.dump(self.usage_log, f, indent=2)
+        """Save usage counts (events are appended as they happen)."""
+        write_json(USAGE_COUNTS_FILE, self.usage_log)
+    
+    def recent_events(self, n: int = 10) -> List[Dict]:
+        """Last n usage events, oldest first."""
+        if not USAGE_EVENTS_FILE.exists():
+            return []
+        with open(USAGE_EVENTS_FILE, 'rb') as f:
+            lines = deque(f, maxlen=n)
+        loads = orjson.loads if HAS_ORJSON else json.loads
+        return [loads(line) for line in lines]
     
     def normalize_text(self, text: str) -> str:
         """Normalize text for matching."""
-        # Lowercase and remove extra whitespace
-        text = text.lower().strip()
-        text = re.sub(r'\s+', ' ', text)
-        # Remove common filler words
-        fillers = ['please', 'can you', 'could you', 'hey', 'um', 'uh', 'like']
-        for filler in fillers:
-            text = text.replace(filler, '')
-        return text.strip()
+        # Lowercase, drop common filler words, then collapse whitespace
+        return _WS_RE.sub(' ', _FILLER_RE.sub('', text.lower())).strip()
     
     def match(self, transcript: str) -> Optional[Dict]:
         """
         Match a voice transcript to a shortcut.
         
         Returns the matched shortcut or None if no match found.
-        Uses fuzzy matching to handle variations.
+        Triggers found verbatim in the transcript win (longest relative to
+        the transcript first); otherwise falls back to fuzzy matching.
         """
         normalized = self.normalize_text(transcript)
+        if self._match_index is None:
+            self._build_match_index()
+        
+        # A transcript equal to a trigger scores 1.0, the maximum
+        hit = self._match_index[5].get(normalized)
+        if hit is not None:
+            return hit
         
         best_match = None
         best_score = 0
         
-        for shortcut in self.shortcuts:
-            trigger = self.normalize_text(shortcut['trigger'])
-            
-            # Exact match
-            if trigger in normalized:
-                score = len(trigger) / len(normalized) if normalized else 0
-                if score > best_score:
-                    best_score = score
-                    best_match = shortcut
-            
-            # Partial match (80% of words)
-            trigger_words = set(trigger.split())
-            transcript_words = set(normalized.split())
-            if trigger_words:
-                overlap = len(trigger_words & transcript_words) / len(trigger_words)
-                if overlap >= 0.8 and overlap > best_score:
-                    best_score = overlap
-                    best_match = shortcut
+        # Exact match
+        trigger_list = self._match_index[2]
+        for i in self._substring_hits(normalized):
+            score = len(trigger_list[i]) / len(normalized) if normalized else 0
+            if score > best_score:
+                best_score = score
+                best_match = self.shortcuts[i]
         
+        if best_match is None:
+            best_match = self._fuzzy_match(normalized)
+        return best_match
+    
+    def _build_match_index(self):
+        """Index triggers for match(): automaton, word index, normalized triggers, words, word sets and exact lookup."""
+        automaton = ahocorasick.Automaton() if HAS_AHOCORASICK else None
+        word_index = {}
+        exact = {}
+        trigger_list = [self.normalize_text(s['trigger']) for s in self.shortcuts]
+        trigger_words = [tuple(trigger.split()) for trigger in trigger_list]
+        word_sets = [frozenset(words) for words in trigger_words]
+        for i, shortcut in enumerate(self.shortcuts):
+            trigger = trigger_list[i]
+            if trigger:
+                exact.setdefault(trigger, shortcut)  # first in list order wins ties
+            if automaton is not None and trigger:
+                automaton.add_word(trigger, automaton.get(trigger, ()) + (i,))
+            for word in word_sets[i]:
+                word_index.setdefault(word, []).append(i)
+        if automaton is not None:
+            if len(automaton):
+                automaton.make_automaton()
+            else:
+                automaton = None
+        self._match_index = (automaton, word_index, trigger_list, trigger_words, word_sets, exact)
+    
+    def _substring_hits(self, normalized: str) -> List[int]:
+        """Positions of shortcuts whose trigger occurs in the transcript, in list order."""
+        automaton, _, trigger_list, _, _, _ = self._match_index
+        if not HAS_AHOCORASICK:
+            return [i for i, trigger in enumerate(trigger_list) if trigger and trigger in normalized]
+        if automaton is None:
+            return []
+        hits = set()
+        for _, ids in automaton.iter(normalized):
+            hits.update(ids)
+        return sorted(hits)
+    
+    def _fuzzy_match(self, normalized: str) -> Optional[Dict]:
+        """
+        Best approximate trigger match, or None.
+        
+        With rapidfuzz, a trigger matches a run of as many consecutive
+        transcript words that scores FUZZY_SCORE_CUTOFF and has every word
+        within its typo_budget of the trigger word in that position: "chek my
+        portfolio for me" runs "check my portfolio", but "moving routine" does
+        not run "morning routine". Failing that (or without rapidfuzz), a
+        trigger matches when the transcript holds WORD_OVERLAP_CUTOFF of its
+        words in any order ("routine morning").
+        """
+        _, word_index, trigger_list, trigger_words, word_sets, _ = self._match_index
+        words = normalized.split()
+        if HAS_RAPIDFUZZ:
+            best_match = None
+            best_score = 0
+            for i, trigger in enumerate(trigger_list):
+                expected = trigger_words[i]
+                size = len(expected)
+                for start in range(len(words) - size + 1 if size else 0):
+                    window = words[start:start + size]
+                    score = fuzz.ratio(' '.join(window), trigger, score_cutoff=FUZZY_SCORE_CUTOFF)
+                    if score > best_score and all(
+                            Levenshtein.distance(said, word, score_cutoff=typo_budget(word)) <= typo_budget(word)
+                            for said, word in zip(window, expected)):
+                        best_score = score
+                        best_match = self.shortcuts[i]
+            if best_match is not None:
+                return best_match
+        
+        # Partial match (80% of words, any order); only shortcuts sharing a word can qualify
+        transcript_words = set(words)
+        candidates = set()
+        for word in transcript_words:
+            candidates.update(word_index.get(word, ()))
+        
+        best_match = None
+        best_score = 0
+        for i in sorted(candidates):
+            trigger_words = word_sets[i]
+            overlap = len(trigger_words & transcript_words) / len(trigger_words)
+            if overlap >= WORD_OVERLAP_CUTOFF and overlap > best_score:
+                best_score = overlap
+                best_match = self.shortcuts[i]
         return best_match
     
     def execute(self, shortcut: Dict, context: Dict = None) -> Dict:
@@ -145,16 +369,17 @@ class ShortcutEngine:
         
         Returns execution result with status and step outputs.
         """
+        now = datetime.now()
         result = {
             "shortcut_id": shortcut['id'],
             "trigger": shortcut['trigger'],
             "status": "success",
             "steps_completed": [],
-            "timestamp": datetime.now().isoformat()
+            "timestamp": now.isoformat()
         }
         
         # Log usage
-        self.log_usage(shortcut['id'])
+        self.log_usage(shortcut['id'], now=now)
         
         # Execute each step
         for i, step in enumerate(shortcut['steps']):
@@ -171,85 +396,86 @@ class ShortcutEngine:
         
         return result
     
-    def log_usage(self, shortcut_id: int):
-        """Log shortcut usage for analytics."""
-        # Update shortcut usage count
-        for shortcut in self.shortcuts:
-            if shortcut['id'] == shortcut_id:
+    def log_usage(self, shortcut_id: int, now: Optional[datetime] = None):
+        """Log shortcut usage for analytics (at now, default the current time)."""
+        now = now or datetime.now()
+        with self._lock:
+            # Update shortcut usage count
+            shortcut = self._by_id.get(shortcut_id)
+            if shortcut is not None:
                 shortcut['usage'] = shortcut.get('usage', 0) + 1
-                break
-        self.save_shortcuts()
-        
-        # Log event
-        today = datetime.now().strftime('%Y-%m-%d')
-        event = {
-            "shortcut_id": shortcut_id,
-            "timestamp": datetime.now().isoformat()
-        }
-        self.usage_log["events"].append(event)
-        
-        # Update daily count
-        if today not in self.usage_log["daily_counts"]:
-            self.usage_log["daily_counts"][today] = {}
-        if str(shortcut_id) not in self.usage_log["daily_counts"][today]:
-            self.usage_log["daily_counts"][today][str(shortcut_id)] = 0
-        self.usage_log["daily_counts"][today][str(shortcut_id)] += 1
-        
-        self.save_usage_log()
+            
+            # Log event
+            today = now.strftime('%Y-%m-%d')
+            event = {
+                "shortcut_id": shortcut_id,
+                "timestamp": now.isoformat()
+            }
+            if self._events_fp is None:
+                self._events_fp = open(USAGE_EVENTS_FILE, 'ab', buffering=0)
+            self._events_fp.write(json_line(event))
+            
+            # Update daily count
+            self.usage_log["daily_counts"][today][str(shortcut_id)] += 1
+            
+            self._mark_dirty(shortcuts=True, usage=True)
     
     def add_shortcut(self, trigger: str, description: str, steps: List[str], 
                      category: str = "custom") -> Dict:
         """Add a new shortcut."""
-        new_id = max([s['id'] for s in self.shortcuts], default=0) + 1
-        shortcut = {
-            "id": new_id,
-            "trigger": trigger,
-            "description": description,
-            "category": category,
-            "steps": steps,
-            "usage": 0,
-            "created": datetime.now().isoformat()
-        }
-        self.shortcuts.append(shortcut)
-        self.save_shortcuts()
+        with self._lock:
+            new_id = max(self._by_id, default=0) + 1
+            shortcut = {
+                "id": new_id,
+                "trigger": trigger,
+                "description": description,
+                "category": category,
+                "steps": steps,
+                "usage": 0,
+                "created": datetime.now().isoformat()
+            }
+            self.shortcuts.append(shortcut)
+            self._by_id[new_id] = shortcut
+            self._match_index = None
+            self._mark_dirty(shortcuts=True)
         return shortcut
     
     def update_shortcut(self, shortcut_id: int, **kwargs) -> Optional[Dict]:
         """Update an existing shortcut."""
-        for shortcut in self.shortcuts:
-            if shortcut['id'] == shortcut_id:
-                for key, value in kwargs.items():
-                    if key in ['trigger', 'description', 'steps', 'category']:
-                        shortcut[key] = value
-                self.save_shortcuts()
-                return shortcut
-        return None
+        with self._lock:
+            shortcut = self._by_id.get(shortcut_id)
+            if shortcut is None:
+                return None
+            for key, value in kwargs.items():
+                if key in ['trigger', 'description', 'steps', 'category']:
+                    shortcut[key] = value
+            if 'trigger' in kwargs:
+                self._match_index = None
+            self._mark_dirty(shortcuts=True)
+        return shortcut
     
     def delete_shortcut(self, shortcut_id: int) -> bool:
         """Delete a shortcut."""
-        original_len = len(self.shortcuts)
-        self.shortcuts = [s for s in self.shortcuts if s['id'] != shortcut_id]
-        if len(self.shortcuts) < original_len:
-            self.save_shortcuts()
-            return True
-        return False
+        with self._lock:
+            if self._by_id.pop(shortcut_id, None) is None:
+                return False
+            self.shortcuts = [s for s in self.shortcuts if s['id'] != shortcut_id]
+            self._match_index = None
+            self._mark_dirty(shortcuts=True)
+        return True
     
     def get_stats(self) -> Dict:
         """Get usage statistics."""
         total_usage = sum(s.get('usage', 0) for s in self.shortcuts)
-        top_used = sorted(self.shortcuts, key=lambda x: x.get('usage', 0), reverse=True)[:5]
-        
-        category_counts = {}
-        for s in self.shortcuts:
-            cat = s.get('category', 'custom')
-            category_counts[cat] = category_counts.get(cat, 0) + 1
+        top_used = heapq.nlargest(5, self.shortcuts, key=lambda x: x.get('usage', 0))
+        category_counts = Counter(s.get('category', 'custom') for s in self.shortcuts)
         
         return {
             "total_shortcuts": len(self.shortcuts),
             "total_usage": total_usage,
             "top_used": top_used,
             "category_counts": category_counts,
-            "recent_events": self.usage_log.get("events", [])[-10:]
+            "recent_events": self.recent_events(10)
         }
     
     def learn_from_usage(self, transcript: str, actions_taken: List[str]):
@@ -276,10 +502,11 @@ if __name__ == "__main__":
     parser.add_argument("--description", "-d", help="Description for new shortcut")
     parser.add_argument("--steps", "-s", nargs="+", help="Workflow steps")
     parser.add_argument("--category", "-c", default="custom", help="Category")
+    parser.add_argument("--pretty", action="store_true", help="Indent the saved shortcuts file")
     
     args = parser.parse_args()
     
-    engine = ShortcutEngine()
+    engine = ShortcutEngine(pretty=args.pretty)  # pending writes are flushed at exit
     
     if args.command == "list":
         print(f"\n{'='*60}")
@@ -0,0 +1,61 @@
+import json
+
+import pytest
+
+import shortcut_engine
+from shortcut_engine import ShortcutEngine
+
+
+@pytest.fixture
+def engine(tmp_path, monkeypatch):
+    """Engine on the default shortcuts, with every file it touches under tmp_path."""
+    monkeypatch.setattr(shortcut_engine, "USAGE_COUNTS_FILE", tmp_path / "counts.json")
+    monkeypatch.setattr(shortcut_engine, "USAGE_EVENTS_FILE", tmp_path / "events.jsonl")
+    monkeypatch.setattr(shortcut_engine, "LEGACY_USAGE_LOG_FILE", tmp_path / "legacy.json")
+    with ShortcutEngine(str(tmp_path / "shortcuts.json")) as engine:
+        yield engine
+
+
+@pytest.mark.parametrize("transcript", [
+    "start my day",
+    "my day",
+    "my music",
+    "show my port",
+    "what's the weather in the morning",
+    # A word borrowed from another trigger ("what's moving") is not a typo
+    "moving routine",
+    "moving my portfolio",
+])
+def test_shared_words_do_not_fuzzy_match(engine, transcript):
+    assert engine.match(transcript) is None
+
+
+@pytest.mark.skipif(not shortcut_engine.HAS_RAPIDFUZZ, reason="word-overlap fallback does not handle typos")
+@pytest.mark.parametrize("transcript, trigger", [
+    ("chek my portfolio", "check my portfolio"),
+    ("check my portfolo", "check my portfolio"),
+    ("morning rutine", "morning routine"),
+    ("whats moving", "what's moving"),
+    ("chek my portfolio for me", "check my portfolio"),
+    ("so um whats movin today", "what's moving"),
+])
+def test_typos_still_fuzzy_match(engine, transcript, trigger):
+    assert engine.match(transcript)['trigger'] == trigger
+
+
+@pytest.mark.parametrize("transcript, trigger", [
+    ("routine morning", "morning routine"),
+    ("my moving check portfolio", "check my portfolio"),
+])
+def test_reordered_trigger_words_match(engine, transcript, trigger):
+    assert engine.match(transcript)['trigger'] == trigger
+
+
+def test_returned_shortcuts_are_json_serializable(engine):
+    added = engine.add_shortcut("open skype", "Start a call", ["Launch Skype"])
+    engine.update_shortcut(added['id'], trigger="open zoom")
+    matched = engine.match("please open zoom")
+    engine.log_usage(matched['id'])
+    
+    assert matched is added
+    json.dumps([added, matched, engine.shortcuts, engine.get_stats()['top_used']])
@@ -15,7 +15,11 @@ Commands:
 """
 
 import argparse
+import sys
+from bisect import bisect_left, bisect_right
 from datetime import datetime
+from operator import itemgetter
+from pathlib import Path
 
 from vol_surface import (
     analyze_vol_surface,
@@ -23,9 +27,35 @@ from vol_surface import (
     generate_vol_report,
     get_vol_smile,
     export_to_json,
-    DEFAULT_WATCHLIST
+    DEFAULT_WATCHLIST,
+    SEVERITY_TAGS
 )
 
+# diskcache is optional - reuses analyses across CLI runs, otherwise every run refetches
+try:
+    import diskcache
+    HAS_DISKCACHE = True
+except ImportError:
+    HAS_DISKCACHE = False
+
+CACHE_DIR = Path(__file__).parent / ".vol_cache"
+CACHE_TTL = 60  # seconds an analysis is reused (intraday IV moves)
+
+_cache = diskcache.Cache(str(CACHE_DIR)) if HAS_DISKCACHE else None
+
+
+def cached_analyze(ticker, current_price=None):
+    """analyze_vol_surface(ticker), reused for CACHE_TTL seconds across runs (errors are not cached)."""
+    if _cache is None:
+        return analyze_vol_surface(ticker, current_price)
+    key = ("analyze_vol_surface", ticker)
+    analysis = _cache.get(key)
+    if analysis is None:
+        analysis = analyze_vol_surface(ticker, current_price)
+        if "error" not in analysis:
+            _cache.set(key, analysis, expire=CACHE_TTL)
+    return analysis
+
 
 def cmd_scan(args):
     """Scan tickers for vol opportunities."""
@@ -33,7 +63,7 @@ def cmd_scan(args):
     
     print(f"\nScanning {len(tickers)} tickers for volatility opportunities...\n")
     
-    results = scan_watchlist(tickers)
+    results = scan_watchlist(tickers, analyze=cached_analyze)
     report = generate_vol_report(results)
     
     print(report)
@@ -49,34 +79,47 @@ def cmd_analyze(args):
     
     print(f"\nAnalyzing volatility surface for {ticker}...\n")
     
-    analysis = analyze_vol_surface(ticker)
+    analysis = cached_analyze(ticker)
     
     if "error" in analysis:
         print(f"Error: {analysis['error']}")
         return
     
-    print(f"{'='*60}")
-    print(f"{ticker} VOLATILITY SURFACE ANALYSIS")
-    print(f"{'='*60}")
-    print()
-    print(f"Current Price: ${analysis['current_price']:.2f}")
-    print(f"Current IV: {analysis['current_iv']:.1f}%" if analysis['current_iv'] else "Current IV: N/A")
-    print(f"Term Structure: {analysis['term_structure']}")
-    print(f"Put/Call Ratio: {analysis['put_call_ratio']:.2f}")
+    iv_pct = analysis.get('iv_percentile')
+    if iv_pct is None:
+        iv_pct_line = "IV Percentile (1y): N/A"
+    elif analysis.get('iv_percentile_seeded'):
+        # Ranked mostly against realized vol, which IV usually exceeds
+        iv_pct_line = f"IV Percentile (1y): {iv_pct:.0f} (vs realized vol, reads high)"
+    else:
+        iv_pct_line = f"IV Percentile (1y): {iv_pct:.0f}"
+    
+    # Build the report and write it once
+    out = [
+        f"{'='*60}",
+        f"{ticker} VOLATILITY SURFACE ANALYSIS",
+        f"{'='*60}",
+        "",
+        f"Current Price: ${analysis['current_price']:.2f}",
+        f"Current IV: {analysis['current_iv']:.1f}%" if analysis['current_iv'] else "Current IV: N/A",
+        iv_pct_line,
+        f"Term Structure: {analysis['term_structure']}",
+        f"Put/Call Ratio: {analysis['put_call_ratio']:.2f}",
+    ]
     
     # Alerts
     if analysis['alerts']:
-        print(f"\n{'-'*60}")
-        print("ALERTS:")
+        out.append(f"\n{'-'*60}")
+        out.append("ALERTS:")
         for alert in analysis['alerts']:
-            severity = {"HIGH": "[!!!]", "MEDIUM": "[!!]", "LOW": "[!]"}.get(alert["severity"], "")
-            print(f"  {severity} {alert['message']}")
+            severity = SEVERITY_TAGS.get(alert["severity"], "")
+            out.append(f"  {severity} {alert['message']}")
     
     # Expirations breakdown
-    print(f"\n{'-'*60}")
-    print("TERM STRUCTURE BY EXPIRATION:")
-    print(f"{'Exp':<12} {'DTE':<6} {'ATM IV':<10} {'Skew':<8} {'P Vol':<10} {'C Vol':<10}")
-    print("-" * 60)
+    out.append(f"\n{'-'*60}")
+    out.append("TERM STRUCTURE BY EXPIRATION:")
+    out.append(f"{'Exp':<12} {'DTE':<6} {'ATM IV':<10} {'Skew':<8} {'P Vol':<10} {'C Vol':<10}")
+    out.append("-" * 60)
     
     for exp in analysis['expirations']:
         exp_date = exp['expiration'][-5:]  # MM-DD
@@ -86,9 +129,10 @@ def cmd_analyze(args):
         p_vol = f"{exp['put_volume']:,}" if exp['put_volume'] else "0"
         c_vol = f"{exp['call_volume']:,}" if exp['call_volume'] else "0"
         
-        print(f"{exp_date:<12} {dte:<6} {atm_iv:<10} {skew:<8} {p_vol:<10} {c_vol:<10}")
+        out.append(f"{exp_date:<12} {dte:<6} {atm_iv:<10} {skew:<8} {p_vol:<10} {c_vol:<10}")
     
-    print()
+    out.append("")
+    sys.stdout.write("\n".join(out) + "\n")
 
 
 def cmd_smile(args):
@@ -103,17 +147,25 @@ def cmd_smile(args):
         print(f"Error: {smile_data['error']}")
         return
     
-    print(f"{'='*60}")
-    print(f"{ticker} VOLATILITY SMILE")
-    print(f"Expiration: {smile_data['expiration']}")
-    print(f"Current Price: ${smile_data['current_price']:.2f}")
-    print(f"{'='*60}")
-    print()
-    print(f"{'Strike':<10} {'Moneyness':<12} {'Call IV':<10} {'Put IV':<10} {'Avg IV':<10}")
-    print("-" * 60)
-    
-    # Filter to show interesting strikes (around ATM)
-    strikes = [s for s in smile_data['smile'] if -20 <= s['moneyness'] <= 20]
+    # Build the report and write it once
+    out = [
+        f"{'='*60}",
+        f"{ticker} VOLATILITY SMILE",
+        f"Expiration: {smile_data['expiration']}",
+        f"Current Price: ${smile_data['current_price']:.2f}",
+        f"{'='*60}",
+        "",
+        f"{'Strike':<10} {'Moneyness':<12} {'Call IV':<10} {'Put IV':<10} {'Avg IV':<10}",
+        "-" * 60,
+    ]
+    
+    # Filter to show interesting strikes (around ATM); the smile is sorted by
+    # strike, hence by moneyness, so the +/-20% band is one contiguous slice
+    smile = smile_data['smile']
+    moneyness_of = itemgetter('moneyness')
+    lo = bisect_left(smile, -20, key=moneyness_of)
+    hi = bisect_right(smile, 20, lo=lo, key=moneyness_of)
+    strikes = smile[lo:hi]
     
     for s in strikes:
         strike = f"${s['strike']:.0f}"
@@ -125,11 +177,10 @@ def cmd_smile(args):
         # Highlight ATM
         marker = " *" if abs(s['moneyness']) < 3 else ""
         
-        print(f"{strike:<10} {moneyness:<12} {call_iv:<10} {put_iv:<10} {avg_iv:<10}{marker}")
+        out.append(f"{strike:<10} {moneyness:<12} {call_iv:<10} {put_iv:<10} {avg_iv:<10}{marker}")
     
-    print()
-    print("* = Near ATM")
-    print()
+    out.extend(["", "* = Near ATM", ""])
+    sys.stdout.write("\n".join(out) + "\n")
 
 
 def cmd_alerts(args):
@@ -138,7 +189,7 @@ def cmd_alerts(args):
     
     print(f"\nScanning {len(tickers)} tickers for alerts...\n")
     
-    results = scan_watchlist(tickers)
+    results = scan_watchlist(tickers, analyze=cached_analyze)
     
     all_alerts = []
     for r in results:
@@ -154,20 +205,24 @@ def cmd_alerts(args):
     severity_order = {"HIGH": 0, "MEDIUM": 1, "LOW": 2}
     all_alerts.sort(key=lambda x: severity_order.get(x[2]["severity"], 3))
     
-    print(f"{'='*70}")
-    print(f"VOLATILITY ALERTS ({len(all_alerts)} total)")
-    print(f"{'='*70}")
+    # Build the report and write it once
+    out = [
+        f"{'='*70}",
+        f"VOLATILITY ALERTS ({len(all_alerts)} total)",
+        f"{'='*70}",
+    ]
     
     current_severity = None
     for ticker, iv, alert in all_alerts:
         if alert["severity"] != current_severity:
             current_severity = alert["severity"]
-            print(f"\n--- {current_severity} SEVERITY ---")
+            out.append(f"\n--- {current_severity} SEVERITY ---")
         
         iv_str = f"(IV: {iv:.1f}%)" if iv else ""
-        print(f"[{ticker}] {alert['message']} {iv_str}")
+        out.append(f"[{ticker}] {alert['message']} {iv_str}")
     
-    print()
+    out.append("")
+    sys.stdout.write("\n".join(out) + "\n")
 
 
 def cmd_term(args):
@@ -176,16 +231,17 @@ def cmd_term(args):
     
     print(f"\nComparing term structures for {len(tickers)} tickers...\n")
     
-    results = scan_watchlist(tickers)
-    
-    print(f"{'='*70}")
-    print("TERM STRUCTURE COMPARISON")
-    print(f"{'='*70}")
-    print()
+    results = scan_watchlist(tickers, analyze=cached_analyze)
     
-    # Header
-    print(f"{'Ticker':<8} {'Structure':<12} {'Near IV':<10} {'Far IV':<10} {'Diff':<10}")
-    print("-" * 60)
+    # Build the report and write it once
+    out = [
+        f"{'='*70}",
+        "TERM STRUCTURE COMPARISON",
+        f"{'='*70}",
+        "",
+        f"{'Ticker':<8} {'Structure':<12} {'Near IV':<10} {'Far IV':<10} {'Diff':<10}",
+        "-" * 60,
+    ]
     
     for r in results:
         if "error" in r:
@@ -206,11 +262,10 @@ def cmd_term(args):
         # Mark inverted
         marker = " <-- INVERTED" if structure == "INVERTED" else ""
         
-        print(f"{ticker:<8} {structure:<12} {near_str:<10} {far_str:<10} {diff_str:<10}{marker}")
+        out.append(f"{ticker:<8} {structure:<12} {near_str:<10} {far_str:<10} {diff_str:<10}{marker}")
     
-    print()
-    print("INVERTED term structure often precedes significant moves.")
-    print()
+    out.extend(["", "INVERTED term structure often precedes significant moves.", ""])
+    sys.stdout.write("\n".join(out) + "\n")
 
 
 def cmd_export(args):
@@ -219,7 +274,7 @@ def cmd_export(args):
     
     print(f"\nExporting analysis for {len(tickers)} tickers...")
     
-    results = scan_watchlist(tickers)
+    results = scan_watchlist(tickers, analyze=cached_analyze)
     output = args.output if args.output else None
     
     json_file = export_to_json(results, output)
@@ -0,0 +1,207 @@
+"""Tests for vol_surface.py (run with pytest from this directory; no network access)."""
+
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+
+import vol_surface
+
+
+@pytest.fixture(autouse=True)
+def tmp_files(tmp_path, monkeypatch):
+    """Point VOL_CACHE and HISTORY_FILE at tmp_path, with an empty in-memory cache."""
+    monkeypatch.setattr(vol_surface, "VOL_CACHE", tmp_path / "vol_data.json")
+    monkeypatch.setattr(vol_surface, "HISTORY_FILE", tmp_path / "vol_history.json")
+    monkeypatch.setattr(vol_surface, "_cache", None)
+    monkeypatch.setattr(vol_surface, "_cache_dirty", False)
+
+
+def chain(ticker, iv=30.0):
+    return {"ticker": ticker, "current_price": 100.0, "current_iv": iv, "term_structure": "FLAT",
+            "expirations": [], "total_call_volume": 1, "total_put_volume": 1, "put_call_ratio": 1.0}
+
+
+class FakeFetch:
+    """Stand-in for fetch_option_chain: records tickers, returns results[ticker] or a good chain."""
+    
+    def __init__(self):
+        self.calls = []
+        self.results = {}
+    
+    def __call__(self, ticker, current_price=None):
+        self.calls.append(ticker)
+        return self.results.get(ticker) or chain(ticker)
+
+
+@pytest.fixture
+def fetches(monkeypatch):
+    fake = FakeFetch()
+    monkeypatch.setattr(vol_surface, "fetch_option_chain", fake)
+    return fake
+
+
+def test_fresh_chain_is_served_from_cache(fetches):
+    first = vol_surface.get_option_chain("AAA")
+    
+    assert vol_surface.get_option_chain("AAA") == first
+    assert fetches.calls == ["AAA"]
+
+
+def test_expired_chain_is_refetched(fetches, monkeypatch):
+    monkeypatch.setattr(vol_surface, "CHAIN_TTL", 0)
+    vol_surface.get_option_chain("AAA")
+    fetches.results["AAA"] = chain("AAA", iv=45.0)
+    
+    assert vol_surface.get_option_chain("AAA")["current_iv"] == 45.0
+    assert fetches.calls == ["AAA", "AAA"]
+
+
+def test_failed_refetch_returns_stale_data(fetches, monkeypatch):
+    monkeypatch.setattr(vol_surface, "CHAIN_TTL", 0)
+    good = vol_surface.get_option_chain("AAA")
+    fetches.results["AAA"] = {"ticker": "AAA", "error": "timeout"}
+    
+    assert vol_surface.get_option_chain("AAA") == {**good, "stale": True}
+    # Without earlier data the error is passed through
+    fetches.results["BBB"] = {"ticker": "BBB", "error": "timeout"}
+    assert vol_surface.get_option_chain("BBB") == {"ticker": "BBB", "error": "timeout"}
+
+
+def test_cache_is_written_once_on_flush(fetches):
+    for ticker in ("AAA", "BBB", "CCC"):
+        vol_surface.get_option_chain(ticker)
+    assert not vol_surface.VOL_CACHE.exists()
+    
+    vol_surface.flush_cache()
+    vol_surface._cache = None  # as in a new process
+    
+    assert vol_surface.get_option_chain("BBB") == chain("BBB")
+    assert fetches.calls == ["AAA", "BBB", "CCC"]
+
+
+def test_cache_entries_age_out(fetches):
+    vol_surface.get_option_chain("AAA")
+    entry = vol_surface._cache_get("tickers", "AAA")
+    entry["fetched_at"] = (datetime.now() - timedelta(seconds=vol_surface.CHAIN_TTL + 1)).isoformat()
+    
+    vol_surface.get_option_chain("AAA")
+    assert fetches.calls == ["AAA", "AAA"]
+
+
+@pytest.mark.parametrize("streaming", [False, True])
+def test_scan_downloads_only_stale_tickers(fetches, monkeypatch, streaming):
+    downloads = []
+    monkeypatch.setattr(vol_surface, "fetch_prices", lambda tickers: downloads.append(list(tickers)) or {})
+    monkeypatch.setattr(vol_surface, "refresh_iv_history", lambda tickers: downloads.append(list(tickers)) or [])
+    analyze = lambda ticker, current_price=None: {"ticker": ticker, "alert_count": 0}
+    
+    def scan(tickers):
+        if streaming:
+            async def drain():
+                return [result async for result in vol_surface.iter_watchlist(tickers, analyze=analyze)]
+            return asyncio.run(drain())
+        return vol_surface.scan_watchlist(tickers, analyze=analyze)
+    
+    for ticker in ("AAA", "BBB"):
+        vol_surface.get_option_chain(ticker)
+    
+    scan(["AAA", "BBB", "CCC"])
+    assert downloads == [["CCC"], ["CCC"]]
+    
+    downloads.clear()
+    scan(["AAA", "BBB"])
+    assert downloads == []
+
+
+def past_samples(ivs, tag=None):
+    """History samples for consecutive days ending yesterday, oldest first."""
+    today = datetime.now().date()
+    days = [(today - timedelta(days=len(ivs) - i)).isoformat() for i in range(len(ivs))]
+    return [[day, iv] + ([tag] if tag else []) for day, iv in zip(days, ivs)]
+
+
+def test_record_iv_needs_min_history():
+    vol_surface.save_history({"AAA": past_samples([20.0] * (vol_surface.MIN_HISTORY - 1))})
+    
+    assert vol_surface.record_iv("AAA", 30.0) == (None, True)
+
+
+def test_record_iv_ranks_against_earlier_days():
+    vol_surface.save_history({"AAA": past_samples([float(iv) for iv in range(1, 41)])})
+    
+    percentile, seeded = vol_surface.record_iv("AAA", 10.5)
+    assert percentile == 25.0  # 10 of 40 earlier samples are lower
+    assert not seeded
+
+
+def test_record_iv_keeps_one_sample_per_day():
+    vol_surface.save_history({"AAA": past_samples([20.0] * 30)})
+    
+    first = vol_surface.record_iv("AAA", 10.0)
+    again = vol_surface.record_iv("AAA", 30.0)
+    
+    samples = vol_surface.load_history()["AAA"]
+    assert len(samples) == 31
+    assert samples[-1] == [datetime.now().date().isoformat(), 30.0]
+    assert first[0] == 0.0 and again[0] == 100.0  # today's earlier sample is not ranked against
+
+
+def test_record_iv_trims_to_history_window():
+    window = vol_surface.HISTORY_WINDOW
+    # The oldest 10 samples fall outside the window and are not ranked against
+    vol_surface.save_history({"AAA": past_samples([0.0] * 10 + [50.0] * window)})
+    
+    assert vol_surface.record_iv("AAA", 40.0)[0] == 0.0
+    samples = vol_surface.load_history()["AAA"]
+    assert len(samples) == window
+    assert samples[-1][1] == 40.0
+
+
+def test_record_iv_flags_seeded_history_until_enough_real_samples():
+    real = vol_surface.MIN_HISTORY
+    seed = past_samples([20.0] * 100, tag=vol_surface.SEED_TAG)
+    
+    vol_surface.save_history({"AAA": seed[:-(real - 1)] + past_samples([30.0] * (real - 1))})
+    # Only the 100 - (real - 1) seed samples of the 100 earlier days are below 25
+    assert vol_surface.record_iv("AAA", 25.0) == (100.0 - (real - 1), True)
+    
+    vol_surface.save_history({"AAA": seed[:-real] + past_samples([30.0] * real)})
+    assert vol_surface.record_iv("AAA", 25.0)[1] is False
+
+
+@pytest.fixture
+def yahoo(monkeypatch):
+    """Offline yfinance: Ticker._download_options answers with a synthetic chain and records each request."""
+    yf = pytest.importorskip("yfinance")
+    import pandas as pd
+    
+    requests = []
+    today = datetime.now().date()
+    expirations = [(today + timedelta(days=7 * (i + 1))).isoformat() for i in range(10)]
+    
+    def fake_download_options(self, date=None):
+        requests.append(date)
+        for exp in expirations:
+            self._expirations[exp] = int(pd.Timestamp(exp).timestamp())
+        quotes = [{"strike": strike, "impliedVolatility": 0.3, "volume": 10, "openInterest": 100,
+                   "lastTradeDate": 0} for strike in (90.0, 95.0, 100.0, 105.0, 110.0)]
+        return {"calls": quotes, "puts": quotes, "underlying": {}}
+    
+    monkeypatch.setattr(yf.Ticker, "_download_options", fake_download_options)
+    return requests
+
+
+def test_cached_expirations_skip_the_list_request(yahoo):
+    cold = vol_surface.fetch_option_chain("AAA", current_price=100.0)
+    assert "error" not in cold
+    assert len(yahoo) == 9 and yahoo.count(None) == 1  # the list, then 8 chains
+    
+    yahoo.clear()
+    warm = vol_surface.fetch_option_chain("AAA", current_price=100.0)
+    assert len(yahoo) == 8 and None not in yahoo
+    assert warm["expirations"] == cold["expirations"]
+    
+    yahoo.clear()
+    assert "error" not in vol_surface.get_vol_smile("AAA", current_price=100.0)
+    assert len(yahoo) == 1 and None not in yahoo
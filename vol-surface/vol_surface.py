@@ -7,12 +7,27 @@ Monitor put/call skew, term structure, IV percentiles.
 Author: PM3
 """
 
+import asyncio
+import atexit
 import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
+from functools import lru_cache, partial
+from operator import gt, lt
 from pathlib import Path
-import yfinance as yf
-import pandas as pd
 import numpy as np
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# orjson is optional - faster C serializer that also handles numpy scalars, falls back to the stdlib json module
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
 
 # Configuration
 DATA_DIR = Path(__file__).parent
@@ -22,107 +37,486 @@ HISTORY_FILE = DATA_DIR / "vol_history.json"
 # Default watchlist for vol monitoring
 DEFAULT_WATCHLIST = ["SPY", "QQQ", "IWM", "AAPL", "MSFT", "NVDA", "TSLA", "META", "GOOGL", "AMZN"]
 
+# Concurrent ticker fetches in scan_watchlist with threads=True (the work is network-bound)
+MAX_WORKERS = 16
+# Concurrent option_chain fetches per ticker in get_option_chain
+EXPIRATION_WORKERS = 8
+# Keep-alive connections held open to Yahoo by the shared session
+HTTP_POOL_SIZE = 32
+
+# Seconds a cached option chain summary stays fresh (intraday IV/volume/OI)
+CHAIN_TTL = 300
+# Seconds a cached expirations list stays fresh (listings change at most daily)
+EXPIRATIONS_TTL = 86400
+
+# VOL_CACHE is read once per process and kept in memory (_cache); stores mark it
+# dirty and flush_cache writes it back once, at the end of a scan or at exit.
+# _cache_lock guards both across scan threads
+_cache = None
+_cache_dirty = False
+_cache_lock = threading.Lock()
+
+# Daily IV samples kept per ticker in HISTORY_FILE (about one trading year),
+# and how many prior days are needed before an IV percentile is reported
+# (and, counting only real IV samples, before it can raise an alert)
+HISTORY_WINDOW = 252
+MIN_HISTORY = 20
+
+# Trading days per realized-volatility sample when seeding IV history from prices,
+# and the tag that marks such samples ([date, vol, SEED_TAG]) in HISTORY_FILE
+REALIZED_VOL_WINDOW = 20
+SEED_TAG = "rv"
+
+# Serializes read-modify-write of HISTORY_FILE across scan threads
+_history_lock = threading.Lock()
+
+# Record layout of expirations_array (missing IVs/skew are NaN)
+EXP_DTYPE = np.dtype([
+    ("dte", "i4"), ("atm_strike", "f8"),
+    ("atm_call_iv", "f8"), ("atm_put_iv", "f8"), ("atm_avg_iv", "f8"),
+    ("otm_put_iv", "f8"), ("otm_call_iv", "f8"), ("skew", "f8"),
+    ("call_volume", "i8"), ("put_volume", "i8"), ("call_oi", "i8"), ("put_oi", "i8"),
+])
+
+# Alert rules as (comparison, threshold, alert type, severity); the first matching rule wins
+SKEW_RULES = (
+    (gt, 10, "HIGH_PUT_SKEW", "MEDIUM"),
+    (lt, -5, "CALL_SKEW", "MEDIUM"),
+)
+PUT_CALL_RULES = (
+    (gt, 1.5, "HIGH_PUT_CALL_RATIO", "MEDIUM"),
+    (lt, 0.5, "LOW_PUT_CALL_RATIO", "LOW"),
+)
+IV_RULES = (
+    (gt, 70, "HIGH_IV", "HIGH"),
+    (gt, 50, "HIGH_IV", "MEDIUM"),
+    (lt, 15, "LOW_IV", "LOW"),
+)
+IV_PERCENTILE_RULES = (
+    (gt, 90, "IV_PERCENTILE_EXTREME", "HIGH"),
+    (lt, 10, "IV_PERCENTILE_EXTREME", "MEDIUM"),
+)
+
+# Report prefix per alert severity
+SEVERITY_TAGS = {"HIGH": "[!!!]", "MEDIUM": "[!!]", "LOW": "[!]"}
+
+ALERT_MESSAGES = {
+    "HIGH_PUT_SKEW": "High put skew ({value:.1f}) for {expiration} - hedging demand elevated",
+    "CALL_SKEW": "Unusual call skew ({value:.1f}) for {expiration} - bullish speculation",
+    "HIGH_PUT_CALL_RATIO": "Elevated put/call ratio ({value:.2f}) - bearish sentiment or hedging",
+    "LOW_PUT_CALL_RATIO": "Low put/call ratio ({value:.2f}) - bullish sentiment",
+    "HIGH_IV": "Elevated IV ({value:.1f}%) - premium selling may be attractive",
+    "LOW_IV": "Low IV ({value:.1f}%) - options are cheap, breakout possible",
+    "IV_PERCENTILE_EXTREME": "IV at the {value:.0f} percentile of its trailing year - extreme vs own history",
+}
+
+
+# yfinance (which pulls in pandas) is imported on first use, keeping startup fast
+_yf = None
+
+def _get_yf():
+    """Import yfinance on first use and return the module."""
+    global _yf
+    if _yf is None:
+        import yfinance
+        _yf = yfinance
+    return _yf
+
+
+def make_session():
+    """Create the keep-alive session shared by every Yahoo request (retries 429/5xx with backoff)."""
+    session = requests.Session()
+    retries = Retry(total=3, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504])
+    session.mount("https://", HTTPAdapter(pool_connections=HTTP_POOL_SIZE,
+                                          pool_maxsize=HTTP_POOL_SIZE,
+                                          max_retries=retries))
+    return session
+
+
+# One pooled session so tickers reuse connections and yfinance's cookie/crumb
+SESSION = make_session()
+
+
+def _now_iso():
+    """Current local time as an ISO 8601 string (cache and report timestamps)."""
+    return datetime.now().isoformat()
+
+
+def read_json(path):
+    """Parse a JSON file."""
+    data = path.read_bytes()
+    return orjson.loads(data) if HAS_ORJSON else json.loads(data)
+
+
+def write_json(path, obj, indent=False):
+    """Write obj as JSON to a temp file, then rename it into place."""
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    if HAS_ORJSON:
+        option = orjson.OPT_SERIALIZE_NUMPY | (orjson.OPT_INDENT_2 if indent else 0)
+        tmp_path.write_bytes(orjson.dumps(obj, option=option))
+    else:
+        with open(tmp_path, "w") as f:
+            json.dump(obj, f, indent=2 if indent else None, default=str)
+    os.replace(tmp_path, path)
+
 
 def load_cache():
-    """Load cached vol data."""
+    """
+    Load cached vol data. Each section ("tickers" for chain summaries,
+    "expirations" for listed expirations as {date: epoch}) maps a ticker to
+    {"data", "fetched_at", "ttl_s"}.
+    """
     if VOL_CACHE.exists():
-        with open(VOL_CACHE) as f:
-            return json.load(f)
-    return {"tickers": {}, "last_updated": None}
+        cache = read_json(VOL_CACHE)
+        cache.setdefault("expirations", {})
+        return cache
+    return {"tickers": {}, "expirations": {}, "last_updated": None}
 
 
 def save_cache(data):
-    """Save vol data to cache."""
-    data["last_updated"] = datetime.now().isoformat()
-    with open(VOL_CACHE, "w") as f:
-        json.dump(data, f, indent=2, default=str)
+    """Save vol data to cache (written to a temp file, then renamed into place)."""
+    data["last_updated"] = _now_iso()
+    write_json(VOL_CACHE, data, indent=True)
+
+
+def load_history():
+    """Load IV history: {ticker: [[date, iv], ...]}, oldest first (seeded samples carry a SEED_TAG)."""
+    if HISTORY_FILE.exists():
+        return read_json(HISTORY_FILE)
+    return {}
+
+
+def save_history(history):
+    """Save IV history (written to a temp file, then renamed into place)."""
+    write_json(HISTORY_FILE, history)
+
+
+def record_iv(ticker, current_iv):
+    """
+    Store today's IV sample for ticker (one per day, last HISTORY_WINDOW days)
+    and return (percentile, seeded): its percentile rank against the earlier
+    days, and whether fewer than MIN_HISTORY of those are real IV samples.
+    Percentile is None until MIN_HISTORY earlier days are recorded.
+    """
+    today = datetime.now().date().isoformat()
+    with _history_lock:
+        history = load_history()
+        samples = [s for s in history.get(ticker, []) if s[0] != today][-HISTORY_WINDOW:]
+        
+        past = np.fromiter((s[1] for s in samples), dtype=float, count=len(samples))
+        percentile = round(float((past < current_iv).mean() * 100), 1) if len(past) >= MIN_HISTORY else None
+        seeded = sum(len(s) == 2 for s in samples) < MIN_HISTORY
+        
+        samples.append([today, current_iv])
+        history[ticker] = samples[-HISTORY_WINDOW:]
+        save_history(history)
+    return percentile, seeded
+
+
+def refresh_iv_history(tickers):
+    """
+    Seed HISTORY_FILE for tickers that have no IV history yet, using rolling
+    REALIZED_VOL_WINDOW-day realized volatility (annualized %) from one batched
+    1y price download as a stand-in for past daily IV. Returns the tickers seeded.
+    
+    IV usually trades above realized vol, so a percentile ranked against these
+    samples reads high; they are tagged SEED_TAG so analyze_vol_surface can flag
+    the percentile and hold its alert until MIN_HISTORY real IV days exist.
+    """
+    with _history_lock:
+        history = load_history()
+    missing = [ticker for ticker in tickers if not history.get(ticker)]
+    if not missing:
+        return []
+    
+    try:
+        hist = _get_yf().download(missing, period="1y", interval="1d", progress=False,
+                                  group_by="ticker", threads=True, session=SESSION)
+    except Exception:
+        return []
+    
+    seeds = {}
+    for ticker in missing:
+        try:
+            closes = (hist[ticker] if hist.columns.nlevels > 1 else hist)["Close"].dropna()
+        except KeyError:
+            continue
+        if len(closes) <= REALIZED_VOL_WINDOW:
+            continue
+        returns = np.diff(np.log(closes.to_numpy(dtype=np.float64)))
+        windows = np.lib.stride_tricks.sliding_window_view(returns, REALIZED_VOL_WINDOW)
+        vols = windows.std(axis=1, ddof=1) * np.sqrt(252) * 100
+        dates = closes.index[REALIZED_VOL_WINDOW:]
+        seeds[ticker] = [[d.date().isoformat(), round(float(v), 2), SEED_TAG]
+                         for d, v in zip(dates, vols)][-HISTORY_WINDOW:]
+    
+    if seeds:
+        with _history_lock:
+            history = load_history()
+            seeds = {ticker: samples for ticker, samples in seeds.items() if not history.get(ticker)}
+            history.update(seeds)
+            save_history(history)
+    return list(seeds)
+
+
+def _loaded_cache():
+    """The in-memory VOL_CACHE contents, loaded on first use (call with _cache_lock held)."""
+    global _cache
+    if _cache is None:
+        _cache = load_cache()
+    return _cache
+
+
+def _cache_get(section, key):
+    """Cache entry for key in a VOL_CACHE section, or None."""
+    with _cache_lock:
+        return _loaded_cache()[section].get(key)
+
+
+def _cache_put(section, key, data, ttl_s):
+    """Store data under key in a VOL_CACHE section, fresh for ttl_s seconds (written by flush_cache)."""
+    global _cache_dirty
+    with _cache_lock:
+        _loaded_cache()[section][key] = {"data": data, "fetched_at": _now_iso(), "ttl_s": ttl_s}
+        _cache_dirty = True
+
+
+def flush_cache():
+    """Write pending VOL_CACHE changes to disk."""
+    global _cache_dirty
+    with _cache_lock:
+        if _cache_dirty:
+            save_cache(_cache)
+            _cache_dirty = False
+
+
+atexit.register(flush_cache)
+
+
+def _is_fresh(entry):
+    """True if a cache entry is younger than its ttl_s."""
+    age = datetime.now() - datetime.fromisoformat(entry["fetched_at"])
+    return age < timedelta(seconds=entry["ttl_s"])
 
 
-def get_option_chain(ticker):
+def get_expirations(ticker, stock):
+    """
+    Listed expirations for a ticker, cached for EXPIRATIONS_TTL.
+    Dates that have passed since the list was cached are dropped.
+    
+    yfinance's option_chain(date) downloads the list again whenever the Ticker
+    has none, so the cached {date: epoch} map is loaded into the Ticker's
+    _expirations. Call this before fetching chains from several threads: on a
+    cache miss it fills the list once, so the threads never race to download it.
+    """
+    entry = _cache_get("expirations", ticker)
+    if entry and _is_fresh(entry) and isinstance(entry["data"], dict):
+        today = datetime.now().date().isoformat()
+        epochs = {exp: epoch for exp, epoch in entry["data"].items() if exp >= today}
+        if epochs:
+            stock._expirations.update(epochs)
+            return tuple(epochs)
+    
+    expirations = stock.options
+    if expirations:
+        _cache_put("expirations", ticker, dict(stock._expirations), EXPIRATIONS_TTL)
+    return expirations
+
+
+@lru_cache(maxsize=1024)
+def _parse_exp(exp):
+    """Expiration date string (YYYY-MM-DD) as a datetime; the same few dates recur across tickers and scans."""
+    return datetime.strptime(exp, "%Y-%m-%d")
+
+
+def _iv_pct(ivs, idx):
+    """Implied volatility at ivs[idx] in percent, or None if idx is None or there is no quote (NaN)."""
+    if idx is None:
+        return None
+    iv = float(ivs[idx])
+    return iv * 100 if iv == iv else None
+
+
+def _column_total(chain, column):
+    """Total of a volume/open interest column (missing values, or a missing column, count as 0)."""
+    if column not in chain.columns:
+        return 0
+    return int(np.nansum(chain[column].to_numpy(dtype=np.float64)))
+
+
+def _process_expiration(stock, exp, current_price):
+    """
+    ATM/OTM IV, skew and volume summary for one expiration.
+    Returns None if the chain is empty or fails to load.
+    """
+    try:
+        opt = stock.option_chain(exp)
+        calls = opt.calls
+        puts = opt.puts
+        
+        if calls.empty or puts.empty:
+            return None
+        
+        # Pull the needed columns out as arrays once; the DataFrames are not used past here
+        call_strikes = calls['strike'].to_numpy(dtype=np.float64)
+        put_strikes = puts['strike'].to_numpy(dtype=np.float64)
+        call_ivs = calls['impliedVolatility'].to_numpy(dtype=np.float64)
+        put_ivs = puts['impliedVolatility'].to_numpy(dtype=np.float64)
+        totals = {
+            "call_volume": _column_total(calls, 'volume'),
+            "put_volume": _column_total(puts, 'volume'),
+            "call_oi": _column_total(calls, 'openInterest'),
+            "put_oi": _column_total(puts, 'openInterest'),
+        }
+        del opt, calls, puts
+        
+        # Find ATM strike (first closest, so the ATM call is that row)
+        atm_idx = int(np.abs(call_strikes - current_price).argmin())
+        atm_strike = float(call_strikes[atm_idx])
+        
+        # Get ATM call and put IV
+        put_idx = np.flatnonzero(put_strikes == atm_strike)
+        atm_call_iv = _iv_pct(call_ivs, atm_idx)
+        atm_put_iv = _iv_pct(put_ivs, put_idx[0] if put_idx.size else None)
+        
+        # Calculate put/call skew (25 delta approximation)
+        otm_put_strike = current_price * 0.95
+        otm_call_strike = current_price * 1.05
+        
+        # Last put at or below, first call at or above the 5% OTM strikes
+        put_idx = np.flatnonzero(put_strikes <= otm_put_strike)
+        call_idx = np.flatnonzero(call_strikes >= otm_call_strike)
+        otm_put_iv = _iv_pct(put_ivs, put_idx[-1] if put_idx.size else None)
+        otm_call_iv = _iv_pct(call_ivs, call_idx[0] if call_idx.size else None)
+        
+        # Calculate skew (put IV - call IV)
+        skew = (otm_put_iv - otm_call_iv) if otm_put_iv and otm_call_iv else None
+        
+        # Days to expiration
+        dte = (_parse_exp(exp) - datetime.now()).days
+        
+        return {
+            "expiration": exp,
+            "dte": dte,
+            "atm_strike": atm_strike,
+            "atm_call_iv": round(atm_call_iv, 2) if atm_call_iv else None,
+            "atm_put_iv": round(atm_put_iv, 2) if atm_put_iv else None,
+            "atm_avg_iv": round((atm_call_iv + atm_put_iv) / 2, 2) if atm_call_iv and atm_put_iv else None,
+            "otm_put_iv": round(otm_put_iv, 2) if otm_put_iv else None,
+            "otm_call_iv": round(otm_call_iv, 2) if otm_call_iv else None,
+            "skew": round(skew, 2) if skew else None,
+            **totals,
+        }
+    except Exception as e:
+        return None
+
+
+def expirations_array(expirations):
+    """
+    Expiration summaries (the list of dicts that is cached and exported) as one
+    EXP_DTYPE structured array, for column-wise checks and totals.
+    """
+    nan = float("nan")
+    return np.array([tuple(nan if e[name] is None else e[name] for name in EXP_DTYPE.names)
+                     for e in expirations], dtype=EXP_DTYPE)
+
+
+def fetch_prices(tickers):
+    """
+    Latest prices for many tickers in one batched download.
+    Returns {ticker: price}; tickers without a price are left out.
+    """
+    import pandas as pd  # already loaded by yfinance
+    
+    try:
+        closes = _get_yf().download(list(tickers), period="1d", progress=False, threads=True, session=SESSION)["Close"]
+    except Exception:
+        return {}
+    if closes.empty:
+        return {}
+    last = closes.iloc[-1]
+    if not isinstance(last, pd.Series):  # single ticker without a ticker column level
+        last = pd.Series({tickers[0]: last})
+    return {ticker: float(price) for ticker, price in last.items() if pd.notna(price)}
+
+
+def _quote_price(stock):
+    """Current price from fast_info, falling back to the (much slower) full info lookup."""
+    try:
+        price = stock.fast_info["last_price"]
+    except Exception:
+        price = None
+    if price:
+        return price
+    info = stock.info
+    return info.get("regularMarketPrice") or info.get("previousClose")
+
+
+def stale_tickers(tickers):
+    """Tickers without a fresh chain summary in VOL_CACHE (the ones a scan will fetch)."""
+    stale = []
+    for ticker in tickers:
+        entry = _cache_get("tickers", ticker)
+        if not (entry and "data" in entry and _is_fresh(entry)):
+            stale.append(ticker)
+    return stale
+
+
+def get_option_chain(ticker, current_price=None):
+    """
+    Options chain summary for a ticker, served from VOL_CACHE while fresh.
+    Cache entries are {"data", "fetched_at", "ttl_s"}; if a refetch fails,
+    the last good data is returned with "stale": True.
+    current_price (e.g. from fetch_prices) saves a quote lookup on a refetch.
+    """
+    entry = _cache_get("tickers", ticker)
+    if entry and "data" in entry:
+        if _is_fresh(entry):
+            return entry["data"]
+    else:
+        entry = None
+    
+    data = fetch_option_chain(ticker, current_price)
+    if "error" in data:
+        return {**entry["data"], "stale": True} if entry else data
+    
+    _cache_put("tickers", ticker, data, CHAIN_TTL)
+    return data
+
+
+def fetch_option_chain(ticker, current_price=None):
     """
     Fetch options chain for a ticker.
     Returns IV data for calls and puts across expirations.
     """
     try:
-        stock = yf.Ticker(ticker)
+        stock = _get_yf().Ticker(ticker, session=SESSION)
         
-        # Get current price
-        info = stock.info
-        current_price = info.get("regularMarketPrice") or info.get("previousClose")
+        # Get current price (unless supplied)
+        current_price = current_price or _quote_price(stock)
         
         if not current_price:
             return {"ticker": ticker, "error": "Could not get current price"}
         
         # Get available expirations
-        expirations = stock.options
+        expirations = get_expirations(ticker, stock)
         
         if not expirations:
             return {"ticker": ticker, "error": "No options available"}
         
-        # Collect IV data for each expiration
-        expirations_data = []
-        
-        for exp in expirations[:8]:  # Limit to 8 nearest expirations
-            try:
-                opt = stock.option_chain(exp)
-                
-                # Get ATM strikes (closest to current price)
-                calls = opt.calls
-                puts = opt.puts
-                
-                if calls.empty or puts.empty:
-                    continue
-                
-                # Find ATM strike
-                atm_strike = min(calls['strike'].tolist(), key=lambda x: abs(x - current_price))
-                
-                # Get ATM call and put IV
-                atm_call = calls[calls['strike'] == atm_strike].iloc[0] if not calls[calls['strike'] == atm_strike].empty else None
-                atm_put = puts[puts['strike'] == atm_strike].iloc[0] if not puts[puts['strike'] == atm_strike].empty else None
-                
-                atm_call_iv = float(atm_call['impliedVolatility']) * 100 if atm_call is not None else None
-                atm_put_iv = float(atm_put['impliedVolatility']) * 100 if atm_put is not None else None
-                
-                # Calculate put/call skew (25 delta approximation)
-                otm_put_strike = current_price * 0.95
-                otm_call_strike = current_price * 1.05
-                
-                otm_put = puts[puts['strike'] <= otm_put_strike].iloc[-1] if not puts[puts['strike'] <= otm_put_strike].empty else None
-                otm_call = calls[calls['strike'] >= otm_call_strike].iloc[0] if not calls[calls['strike'] >= otm_call_strike].empty else None
-                
-                otm_put_iv = float(otm_put['impliedVolatility']) * 100 if otm_put is not None else None
-                otm_call_iv = float(otm_call['impliedVolatility']) * 100 if otm_call is not None else None
-                
-                # Calculate skew (put IV - call IV)
-                skew = (otm_put_iv - otm_call_iv) if otm_put_iv and otm_call_iv else None
-                
-                # Days to expiration
-                exp_date = datetime.strptime(exp, "%Y-%m-%d")
-                dte = (exp_date - datetime.now()).days
-                
-                expirations_data.append({
-                    "expiration": exp,
-                    "dte": dte,
-                    "atm_strike": atm_strike,
-                    "atm_call_iv": round(atm_call_iv, 2) if atm_call_iv else None,
-                    "atm_put_iv": round(atm_put_iv, 2) if atm_put_iv else None,
-                    "atm_avg_iv": round((atm_call_iv + atm_put_iv) / 2, 2) if atm_call_iv and atm_put_iv else None,
-                    "otm_put_iv": round(otm_put_iv, 2) if otm_put_iv else None,
-                    "otm_call_iv": round(otm_call_iv, 2) if otm_call_iv else None,
-                    "skew": round(skew, 2) if skew else None,
-                    "call_volume": int(calls['volume'].sum()) if 'volume' in calls.columns else 0,
-                    "put_volume": int(puts['volume'].sum()) if 'volume' in puts.columns else 0,
-                    "call_oi": int(calls['openInterest'].sum()) if 'openInterest' in calls.columns else 0,
-                    "put_oi": int(puts['openInterest'].sum()) if 'openInterest' in puts.columns else 0,
-                })
-            except Exception as e:
-                continue
+        # Collect IV data for each expiration (fetched concurrently)
+        nearest = expirations[:8]  # Limit to 8 nearest expirations
+        with ThreadPoolExecutor(max_workers=EXPIRATION_WORKERS) as ex:
+            expirations_data = [row for row in ex.map(lambda exp: _process_expiration(stock, exp, current_price), nearest)
+                                if row is not None]
         
         if not expirations_data:
             return {"ticker": ticker, "error": "Could not process options data"}
         
         # Calculate term structure metrics
-        ivs = [e["atm_avg_iv"] for e in expirations_data if e["atm_avg_iv"]]
+        table = expirations_array(expirations_data)
+        atm_ivs = table["atm_avg_iv"]
+        ivs = atm_ivs[~np.isnan(atm_ivs) & (atm_ivs != 0)]
         
         term_structure = "UNKNOWN"
         if len(ivs) >= 2:
@@ -133,8 +527,11 @@ def get_option_chain(ticker):
             else:
                 term_structure = "FLAT"
         
-        # Calculate IV percentile (would need historical data in production)
-        current_iv = ivs[0] if ivs else None
+        # IV percentile is ranked against HISTORY_FILE in analyze_vol_surface
+        current_iv = float(ivs[0]) if len(ivs) else None
+        
+        total_call_volume = int(table["call_volume"].sum())
+        total_put_volume = int(table["put_volume"].sum())
         
         return {
             "ticker": ticker,
@@ -142,22 +539,41 @@ def get_option_chain(ticker):
             "current_iv": round(current_iv, 2) if current_iv else None,
             "term_structure": term_structure,
             "expirations": expirations_data,
-            "total_call_volume": sum(e.get("call_volume", 0) for e in expirations_data),
-            "total_put_volume": sum(e.get("put_volume", 0) for e in expirations_data),
-            "put_call_ratio": round(sum(e.get("put_volume", 0) for e in expirations_data) / 
-                                   max(1, sum(e.get("call_volume", 0) for e in expirations_data)), 2),
-            "fetch_time": datetime.now().isoformat()
+            "total_call_volume": total_call_volume,
+            "total_put_volume": total_put_volume,
+            "put_call_ratio": round(total_put_volume / max(1, total_call_volume), 2),
+            "fetch_time": _now_iso()
         }
     
     except Exception as e:
         return {"ticker": ticker, "error": str(e)}
 
 
-def analyze_vol_surface(ticker):
+def classify(values, rules):
+    """
+    Index of the first matching rule for each value (-1 where none match).
+    Missing values (None) never match.
+    """
+    values = np.asarray(values, dtype=float)
+    conditions = [compare(values, threshold) for compare, threshold, _, _ in rules]
+    return np.select(conditions, list(range(len(rules))), default=-1)
+
+
+def _rule_alert(rule, value, expiration=None):
+    """Build the alert dict for a matched rule."""
+    _, _, alert_type, severity = rule
+    return {
+        "type": alert_type,
+        "message": ALERT_MESSAGES[alert_type].format(value=value, expiration=expiration),
+        "severity": severity
+    }
+
+
+def analyze_vol_surface(ticker, current_price=None):
     """
     Perform comprehensive vol surface analysis.
     """
-    data = get_option_chain(ticker)
+    data = get_option_chain(ticker, current_price)
     
     if "error" in data:
         return data
@@ -173,6 +589,11 @@ def analyze_vol_surface(ticker):
         "alerts": []
     }
     
+    # Rank current IV against this ticker's stored daily history; while that is
+    # mostly realized-vol seed the rank is biased high, so it is flagged and not alerted on
+    analysis["iv_percentile"], analysis["iv_percentile_seeded"] = (
+        record_iv(ticker, data["current_iv"]) if data["current_iv"] else (None, False))
+    
     # Check for inverted term structure (often precedes moves)
     if data["term_structure"] == "INVERTED":
         alerts.append({
@@ -181,66 +602,60 @@ def analyze_vol_surface(ticker):
             "severity": "HIGH"
         })
     
-    # Check for extreme skew
-    for exp in data["expirations"][:3]:  # Check near-term expirations
-        if exp["skew"] and exp["skew"] > 10:
-            alerts.append({
-                "type": "HIGH_PUT_SKEW",
-                "message": f"High put skew ({exp['skew']:.1f}) for {exp['expiration']} - hedging demand elevated",
-                "severity": "MEDIUM"
-            })
-        elif exp["skew"] and exp["skew"] < -5:
-            alerts.append({
-                "type": "CALL_SKEW",
-                "message": f"Unusual call skew ({exp['skew']:.1f}) for {exp['expiration']} - bullish speculation",
-                "severity": "MEDIUM"
-            })
+    # Check for extreme skew on near-term expirations
+    near_term = data["expirations"][:3]
+    rule_idx = classify(expirations_array(near_term)["skew"], SKEW_RULES)
+    alerts.extend(_rule_alert(SKEW_RULES[i], exp["skew"], exp["expiration"])
+                  for exp, i in zip(near_term, rule_idx.tolist()) if i >= 0)
     
     # Check put/call ratio
-    if data["put_call_ratio"] > 1.5:
-        alerts.append({
-            "type": "HIGH_PUT_CALL_RATIO",
-            "message": f"Elevated put/call ratio ({data['put_call_ratio']:.2f}) - bearish sentiment or hedging",
-            "severity": "MEDIUM"
-        })
-    elif data["put_call_ratio"] < 0.5:
-        alerts.append({
-            "type": "LOW_PUT_CALL_RATIO",
-            "message": f"Low put/call ratio ({data['put_call_ratio']:.2f}) - bullish sentiment",
-            "severity": "LOW"
-        })
+    i = classify([data["put_call_ratio"]], PUT_CALL_RULES)[0]
+    if i >= 0:
+        alerts.append(_rule_alert(PUT_CALL_RULES[i], data["put_call_ratio"]))
     
     # Check IV levels (rough percentiles)
     if data["current_iv"]:
-        if data["current_iv"] > 50:
-            alerts.append({
-                "type": "HIGH_IV",
-                "message": f"Elevated IV ({data['current_iv']:.1f}%) - premium selling may be attractive",
-                "severity": "HIGH" if data["current_iv"] > 70 else "MEDIUM"
-            })
-        elif data["current_iv"] < 15:
-            alerts.append({
-                "type": "LOW_IV",
-                "message": f"Low IV ({data['current_iv']:.1f}%) - options are cheap, breakout possible",
-                "severity": "LOW"
-            })
+        i = classify([data["current_iv"]], IV_RULES)[0]
+        if i >= 0:
+            alerts.append(_rule_alert(IV_RULES[i], data["current_iv"]))
+    
+    i = classify([analysis["iv_percentile"]], IV_PERCENTILE_RULES)[0]
+    if i >= 0 and not analysis["iv_percentile_seeded"]:
+        alerts.append(_rule_alert(IV_PERCENTILE_RULES[i], analysis["iv_percentile"]))
     
     analysis["alerts"] = alerts
     analysis["alert_count"] = len(alerts)
-    analysis["analysis_time"] = datetime.now().isoformat()
+    analysis["analysis_time"] = _now_iso()
     
     return analysis
 
 
-def scan_watchlist(tickers=None):
-    """Scan entire watchlist for vol opportunities."""
+def scan_watchlist(tickers=None, threads=True, analyze=analyze_vol_surface):
+    """
+    Scan entire watchlist for vol opportunities.
+    threads: True for up to MAX_WORKERS tickers at once, an int for that many, False for one at a time.
+    analyze is the per-ticker function, e.g. a caching wrapper of analyze_vol_surface,
+    and is passed current_price from one batched price download. Only tickers whose
+    chain is not freshly cached are downloaded (or have IV history seeded); a scan
+    served entirely from cache makes no requests.
+    """
     tickers = tickers or DEFAULT_WATCHLIST
+    workers = MAX_WORKERS if threads is True else max(1, int(threads))
+    stale = stale_tickers(tickers)
+    prices = {}
+    if stale:
+        prices = fetch_prices(stale)
+        refresh_iv_history(stale)
     
-    results = []
-    for ticker in tickers:
-        print(f"Scanning {ticker}...")
-        analysis = analyze_vol_surface(ticker)
-        results.append(analysis)
+    results = [None] * len(tickers)
+    with ThreadPoolExecutor(max_workers=min(workers, len(tickers))) as ex:
+        futures = {ex.submit(analyze, ticker, current_price=prices.get(ticker)): i for i, ticker in enumerate(tickers)}
+        # Progress is printed from this thread only, as each ticker finishes
+        for done, future in enumerate(as_completed(futures), 1):
+            i = futures[future]
+            results[i] = future.result()
+            print(f"Scanned {tickers[i]} ({done}/{len(tickers)})")
+    flush_cache()
     
     # Sort by alert count
     results.sort(key=lambda x: x.get("alert_count", 0), reverse=True)
@@ -248,6 +663,46 @@ def scan_watchlist(tickers=None):
     return results
 
 
+async def iter_watchlist(tickers=None, analyze=analyze_vol_surface):
+    """
+    Async generator yielding (index in tickers, analysis) for each ticker as soon
+    as it is ready (same prefetched prices and thread pool size as scan_watchlist).
+    """
+    tickers = tickers or DEFAULT_WATCHLIST
+    loop = asyncio.get_running_loop()
+    with ThreadPoolExecutor(max_workers=min(MAX_WORKERS, len(tickers))) as pool:
+        stale = stale_tickers(tickers)
+        prices = {}
+        if stale:
+            prices = await loop.run_in_executor(pool, fetch_prices, stale)
+            await loop.run_in_executor(pool, refresh_iv_history, stale)
+        
+        async def run(i, ticker):
+            return i, await loop.run_in_executor(pool, partial(analyze, ticker, current_price=prices.get(ticker)))
+        
+        for next_done in asyncio.as_completed([run(i, ticker) for i, ticker in enumerate(tickers)]):
+            yield await next_done
+    flush_cache()
+
+
+async def _scan_streaming(tickers):
+    """Print each ticker's result line as it arrives; return all results sorted like scan_watchlist."""
+    results = [None] * len(tickers)
+    done = 0
+    async for i, result in iter_watchlist(tickers):
+        results[i] = result
+        done += 1
+        if "error" in result:
+            status = f"error: {result['error']}"
+        else:
+            iv = f"{result['current_iv']:.1f}%" if result["current_iv"] else "N/A"
+            status = f"IV {iv}, {result['alert_count']} alerts"
+        print(f"Scanned {tickers[i]} ({done}/{len(tickers)}) - {status}")
+    
+    results.sort(key=lambda x: x.get("alert_count", 0), reverse=True)
+    return results
+
+
 def generate_vol_report(results):
     """Generate formatted vol surface report."""
     lines = [
@@ -298,7 +753,7 @@ def generate_vol_report(results):
         ])
         
         for ticker, alert in all_alerts:
-            severity = {"HIGH": "[!!!]", "MEDIUM": "[!!]", "LOW": "[!]"}.get(alert["severity"], "")
+            severity = SEVERITY_TAGS.get(alert["severity"], "")
             lines.append(f"{severity} [{ticker}] {alert['message']}")
     
     # Term structure breakdown
@@ -316,18 +771,17 @@ def generate_vol_report(results):
     return "\n".join(lines)
 
 
-def get_vol_smile(ticker, expiration=None):
+def get_vol_smile(ticker, expiration=None, current_price=None):
     """
     Get volatility smile for a specific expiration.
     Shows IV across strikes.
     """
     try:
-        stock = yf.Ticker(ticker)
+        stock = _get_yf().Ticker(ticker, session=SESSION)
         
-        info = stock.info
-        current_price = info.get("regularMarketPrice") or info.get("previousClose")
+        current_price = current_price or _quote_price(stock)
         
-        expirations = stock.options
+        expirations = get_expirations(ticker, stock)
         if not expirations:
             return {"error": "No options available"}
         
@@ -338,22 +792,26 @@ def get_vol_smile(ticker, expiration=None):
         calls = opt.calls
         puts = opt.puts
         
-        # Merge calls and puts
-        smile_data = []
+        # Merge calls and puts: each call strike is paired with the first put at that strike
+        columns = ['strike', 'impliedVolatility']
+        merged = calls[columns].astype(float).merge(
+            puts[columns].astype(float).drop_duplicates('strike'),
+            on='strike', how='left', suffixes=('_call', '_put'))
+        strikes = merged['strike'].to_numpy()
+        moneyness = (strikes / current_price - 1) * 100  # % OTM/ITM
+        call_ivs = merged['impliedVolatility_call'].to_numpy() * 100
+        put_ivs = merged['impliedVolatility_put'].to_numpy() * 100
         
-        for _, row in calls.iterrows():
-            strike = row['strike']
-            call_iv = row['impliedVolatility'] * 100 if pd.notna(row['impliedVolatility']) else None
-            
-            # Find matching put
-            put_row = puts[puts['strike'] == strike]
-            put_iv = put_row.iloc[0]['impliedVolatility'] * 100 if not put_row.empty and pd.notna(put_row.iloc[0]['impliedVolatility']) else None
-            
-            moneyness = (strike / current_price - 1) * 100  # % OTM/ITM
+        smile_data = []
+        for strike, m, call_iv, put_iv in zip(strikes.tolist(), moneyness.tolist(),
+                                              call_ivs.tolist(), put_ivs.tolist()):
+            # NaN means no quote (or no matching put)
+            call_iv = call_iv if call_iv == call_iv else None
+            put_iv = put_iv if put_iv == put_iv else None
             
             smile_data.append({
                 "strike": strike,
-                "moneyness": round(moneyness, 1),
+                "moneyness": round(m, 1),
                 "call_iv": round(call_iv, 2) if call_iv else None,
                 "put_iv": round(put_iv, 2) if put_iv else None,
                 "avg_iv": round((call_iv + put_iv) / 2, 2) if call_iv and put_iv else None
@@ -374,11 +832,10 @@ def export_to_json(results, output_file=None):
     """Export analysis to JSON."""
     output_file = output_file or (DATA_DIR / "vol_analysis.json")
     
-    with open(output_file, "w") as f:
-        json.dump({
-            "generated": datetime.now().isoformat(),
-            "results": results
-        }, f, indent=2, default=str)
+    write_json(Path(output_file), {
+        "generated": _now_iso(),
+        "results": results
+    }, indent=True)
     
     return str(output_file)
 
@@ -391,7 +848,7 @@ if __name__ == "__main__":
     print("Scanning volatility surfaces...")
     print()
     
-    results = scan_watchlist(tickers)
+    results = asyncio.run(_scan_streaming(tickers))
     report = generate_vol_report(results)
     
     print(report)